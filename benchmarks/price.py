@@ -0,0 +1,111 @@
+"""Compare `compare_was_now()` with the former implementation, which copied
+the whole dataframe to cast price columns.
+
+    python benchmarks/price.py [rows] [columns]
+"""
+import sys
+import timeit
+import tracemalloc
+
+from arche.rules.price import compare_was_now
+from arche.rules.result import Outcome, Result
+import numpy as np
+import pandas as pd
+
+
+def copy_compare_was_now(df: pd.DataFrame, tagged_fields: dict) -> Result:
+    price_was_fields = tagged_fields.get("product_price_was_field")
+    price_fields = tagged_fields.get("product_price_field")
+    items_number = len(df.index)
+
+    result = Result("Compare Price Was And Now")
+
+    if not price_was_fields or not price_fields:
+        result.outcome = Outcome.SKIPPED
+        return result
+
+    price_field = price_fields[0]
+    price_was_field = price_was_fields[0]
+    prices = df.copy()
+    prices[price_was_field] = prices[price_was_field].astype(float)
+    prices[price_field] = prices[price_field].astype(float)
+
+    df_prices_less = pd.DataFrame(
+        prices[prices[price_was_field] < prices[price_field]],
+        columns=[price_was_field, price_field],
+    )
+
+    price_less_percent = "{:.2%}".format(len(df_prices_less) / items_number)
+
+    if not df_prices_less.empty:
+        error = f"Past price is less than current for {len(df_prices_less)} items"
+        result.add_error(
+            f"{price_less_percent} ({len(df_prices_less)}) of "
+            f"items with {price_was_field} < {price_field}",
+            errors={error: set(df_prices_less.index)},
+        )
+
+    df_prices_equals = pd.DataFrame(
+        prices[prices[price_was_field] == prices[price_field]],
+        columns=[price_was_field, price_field],
+    )
+    price_equal_percent = "{:.2%}".format(len(df_prices_equals) / items_number)
+
+    if not df_prices_equals.empty:
+        result.add_warning(
+            (
+                f"{price_equal_percent} ({len(df_prices_equals)}) "
+                f"of items with {price_was_field} = {price_field}"
+            ),
+            errors=(
+                {
+                    f"Prices equal for {len(df_prices_equals)} items": set(
+                        df_prices_equals.index
+                    )
+                }
+            ),
+        )
+
+    result.items_count = len(df.index)
+    return result
+
+
+def make_df(rows: int, columns: int) -> pd.DataFrame:
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame(
+        {
+            "price": rng.randint(1, 100, rows).astype(str),
+            "price_was": rng.randint(1, 100, rows).astype(float),
+        }
+    )
+    for i in range(columns):
+        df[f"text_{i}"] = rng.choice(["Book", "Movie", "Guitar"], rows).astype(object)
+    return df
+
+
+def peak_memory(f, *args) -> float:
+    tracemalloc.start()
+    f(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024**2
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    columns = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    df = make_df(rows, columns)
+    tagged_fields = {
+        "product_price_field": ["price"],
+        "product_price_was_field": ["price_was"],
+    }
+    assert copy_compare_was_now(df, tagged_fields) == compare_was_now(df, tagged_fields)
+    for f in [copy_compare_was_now, compare_was_now]:
+        seconds = min(
+            timeit.repeat(lambda f=f: f(df, tagged_fields), number=1, repeat=3)
+        )
+        memory = peak_memory(f, df, tagged_fields)
+        print(
+            f"{f.__name__:>20}: {seconds:.3f}s, {memory:.0f}MiB peak "
+            f"for {rows:_} rows and {columns + 2} columns"
+        )
@@ -0,0 +1,45 @@
+"""Compare `Items.clean_empty()` with the former per cell `applymap` cleaning.
+
+    python benchmarks/process_df.py [rows]
+"""
+import numbers
+import sys
+import timeit
+
+from arche.readers.items import Items
+import numpy as np
+import pandas as pd
+
+
+def applymap_clean(df: pd.DataFrame) -> pd.DataFrame:
+    return df.applymap(lambda x: x if x or isinstance(x, numbers.Real) else np.nan)
+
+
+def vectorized_clean(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    Items.clean_empty(df)
+    return df
+
+
+def make_df(rows: int) -> pd.DataFrame:
+    rng = np.random.RandomState(0)
+    return pd.DataFrame(
+        {
+            "price": rng.rand(rows),
+            "stock": rng.randint(0, 100, rows),
+            "available": rng.rand(rows) > 0.5,
+            "name": rng.choice(["", "Book", "Movie", "Guitar"], rows),
+            "tags": [[] if i % 3 else ["new"] for i in range(rows)],
+            "attributes": [{} if i % 4 else {"color": "red"} for i in range(rows)],
+            "description": [None if i % 5 else "text" for i in range(rows)],
+        }
+    )
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    df = make_df(rows)
+    pd.testing.assert_frame_equal(applymap_clean(df), vectorized_clean(df))
+    for f in [applymap_clean, vectorized_clean]:
+        seconds = min(timeit.repeat(lambda f=f: f(df), number=1, repeat=3))
+        print(f"{f.__name__:>16}: {seconds:.3f}s for {rows:_} rows")
@@ -1,9 +1,16 @@
 from functools import lru_cache
 import logging
-from typing import Iterable, List, Optional, Union, cast
+import os
+from typing import Callable, Iterable, List, Optional, Union, cast
 
 from arche.data_quality_report import DataQualityReport
-from arche.readers.items import Items, CollectionItems, JobItems, RawItems
+from arche.readers.items import (
+    CollectionItems,
+    Items,
+    JobItems,
+    RawItems,
+    StreamingJobItems,
+)
 from arche.readers.schema import Schema, SchemaSource
 from arche.report import Report
 import arche.rules.category as category_rules
@@ -15,6 +22,8 @@ import arche.rules.metadata as metadata_rules
 from arche.rules.others import compare_boolean_fields, garbage_symbols
 import arche.rules.price as price_rules
 from arche.tools import api, helpers, maintenance
+from arche.tools.cache import Cache
+import arche.tools.schema as schema_tools
 import IPython
 import pandas as pd
 
@@ -23,6 +32,17 @@ logger = logging.getLogger("arche")
 
 
 class Arche:
+    # rules which read tagged fields, see `get_rules_fields()`
+    tagged_rules: List[Callable] = [
+        price_rules.compare_was_now,
+        duplicate_rules.find_by_tags,
+        category_rules.get_coverage_per_category,
+        category_rules.get_difference,
+        price_rules.compare_prices_for_same_urls,
+        price_rules.compare_names_for_same_urls,
+        price_rules.compare_prices_for_same_names,
+    ]
+
     def __init__(
         self,
         source: Union[str, pd.DataFrame, RawItems],
@@ -32,6 +52,9 @@ class Arche:
         start: Union[str, int] = None,
         filters: Optional[api.Filters] = None,
         expand: bool = None,
+        cache: Optional[Cache] = None,
+        keep_raw: bool = True,
+        fields: Optional[List[str]] = None,
     ):
         """
         Args:
@@ -42,6 +65,12 @@ class Arche:
             start: an item key to start reading from
             filters: Scrapinghub filtering, see
             https://python-scrapinghub.readthedocs.io/en/latest/client/apidocs.html#scrapinghub.client.items.Items # noqa
+            cache: a local storage to read finished jobs and collections from
+            keep_raw: if False, keep only dataframes of cloud items and rebuild
+            raw items from them for schema validation. Halves memory usage,
+            but null and empty values become missing
+            fields: read only these fields of cloud items, e.g. the fields
+            tagged rules need, see `get_rules_fields()`
         """
         if expand:
             maintenance.deprecate(
@@ -70,6 +99,9 @@ class Arche:
         self.start = start
         self.count = count
         self.filters = filters
+        self.cache = cache
+        self.keep_raw = keep_raw
+        self.fields = fields
         self._source_items = None
         self._target_items = None
         self.report = Report()
@@ -78,7 +110,13 @@ class Arche:
     def source_items(self):
         if not self._source_items:
             self._source_items = self.get_items(
-                self.source, self.count, self.start, self.filters
+                self.source,
+                self.count,
+                self.start,
+                self.filters,
+                self.cache,
+                self.keep_raw,
+                self.fields,
             )
         return self._source_items
 
@@ -88,7 +126,13 @@ class Arche:
             return None
         if not self._target_items:
             self._target_items = self.get_items(
-                self.target, self.count, self.start, self.filters
+                self.target,
+                self.count,
+                self.start,
+                self.filters,
+                self.cache,
+                self.keep_raw,
+                self.fields,
             )
         return self._target_items
 
@@ -109,19 +153,59 @@ class Arche:
         count: Optional[int],
         start: Optional[str],
         filters: Optional[api.Filters],
+        cache: Optional[Cache] = None,
+        keep_raw: bool = True,
+        fields: Optional[List[str]] = None,
     ) -> Items:
         if isinstance(source, pd.DataFrame):
             return Items.from_df(source)
         elif isinstance(source, Iterable) and not isinstance(source, str):
             return Items.from_array(cast(RawItems, source))
         elif helpers.is_job_key(source):
-            return JobItems(source, count, int(start or 0), filters)
+            return JobItems(
+                source, count, int(start or 0), filters, cache, keep_raw, fields
+            )
         elif helpers.is_collection_key(source):
-            return CollectionItems(source, count, start, filters)
+            return CollectionItems(
+                source, count, start, filters, cache, keep_raw, fields
+            )
         else:
             raise ValueError(f"'{source}' is not a valid job or collection key")
 
-    def save_result(self, rule_result):
+    def get_rules_fields(self, rules: Optional[Iterable[Callable]] = None) -> List[str]:
+        """Get the fields which rules read, resolving their tags with the schema.
+        Set them to `fields` before items are read to fetch only these fields, e.g.
+
+        >>> a = Arche("112358/13/21", schema)
+        >>> a.fields = a.get_rules_fields()
+        >>> a.run_customized_rules(a.source_items, a.schema.tags)
+
+        Args:
+            rules: rules declaring tags with `arche.rules.reads()`,
+            defaults to `tagged_rules`
+        """
+        if not self.schema:
+            raise ValueError("Schema is empty")
+        tags = [t for r in rules or self.tagged_rules for t in getattr(r, "tags", [])]
+        return self.schema.get_fields(tags)
+
+    def check_all_fields(self, method: str) -> None:
+        """Raise if items are read with `fields`, since schema, coverage and
+        other general rules would report the missing fields as errors."""
+        if self.fields is not None:
+            raise ValueError(
+                f"{method}() needs all fields of items, but only {self.fields} "
+                "are read. Use rules reading tagged fields instead, "
+                "see `get_rules_fields()`"
+            )
+
+    def save_result(self, rule_result, items: Optional[Items] = None):
+        """Save a result to the report. Its keys are linked with `items`,
+        source items by default."""
+        if rule_result.keys_url is None:
+            if items is None:
+                items = self._source_items
+            rule_result.keys_url = getattr(items, "keys_url", None)
         self.report.save(rule_result)
 
     def report_all(
@@ -132,6 +216,7 @@ class Arche:
         Args:
             uniques: see `arche.rules.duplicates.find_by`
         """
+        self.check_all_fields("report_all")
         if uniques:
             self.uniques = uniques
         self.run_all_rules()
@@ -139,6 +224,7 @@ class Arche:
         self.report(keys_limit=10 if short else None)
 
     def run_all_rules(self) -> None:
+        self.check_all_fields("run_all_rules")
         if isinstance(self.source_items, JobItems):
             self.check_metadata(self.source_items.job)
             if self.target_items:
@@ -152,6 +238,7 @@ class Arche:
             raise ValueError("Collections are not supported")
         if not self.schema:
             raise ValueError("Schema is empty")
+        self.check_all_fields("data_quality_report")
         IPython.display.clear_output()
         DataQualityReport(self.source_items, self.schema, self.report, bucket)
 
@@ -169,30 +256,140 @@ class Arche:
                 duplicate_rules.find_by(self.source_items.df, self.uniques)
             )
 
-    def validate_with_json_schema(self) -> None:
+    def validate_with_json_schema(
+        self,
+        workers: int = 1,
+        hybrid: bool = False,
+        memo_size: int = 0,
+        columnar: bool = False,
+    ) -> None:
         """Run JSON schema check and output results. It will try to find all errors, but
-        there are no guarantees. Slower than `check_with_json_schema()`
+        there are no guarantees. Slower than `glance()`
+
+        Args:
+            workers: the number of processes to validate items in,
+            e.g. `multiprocessing.cpu_count()`
+            hybrid: look for all errors only in items which fail `glance()` validation,
+            which is nearly as fast when most items are valid
+            memo_size: the number of items to remember errors of, so identical
+            items are validated once, e.g. 100_000
+            columnar: check type, enum, pattern, minimum, maximum, minLength and
+            maxLength of top level properties by columns, which is much faster
         """
+        self.check_all_fields("validate_with_json_schema")
         res = schema_rules.validate(
-            self.schema.raw, self.source_items.raw, self.source_items.df.index
+            self.schema.raw,
+            self.source_items.raw,
+            self.source_items.df.index,
+            workers=workers,
+            hybrid=hybrid,
+            memo_size=memo_size,
+            columnar=columnar,
         )
         self.save_result(res)
         self.report(res)
 
-    def glance(self) -> None:
+    def glance(self, workers: int = 1, memo_size: int = 0) -> None:
         """Run JSON schema check and output results. In most cases it will return
         only the first error per item. Usable for big jobs as it's about 100x faster than
         `validate_with_json_schema()`.
+
+        Args:
+            workers: the number of processes to validate items in
+            memo_size: the number of items to remember errors of
         """
+        self.check_all_fields("glance")
         res = schema_rules.validate(
             self.schema.raw,
             self.source_items.raw,
             self.source_items.df.index,
             fast=True,
+            workers=workers,
+            memo_size=memo_size,
         )
         self.save_result(res)
         res.show()
 
+    def validate_stream(
+        self,
+        fast: bool = False,
+        hybrid: bool = False,
+        memo_size: int = 0,
+        chunk_size: int = 10_000,
+    ) -> None:
+        """Run JSON schema check on a job reading it from API chunk by chunk,
+        so only keys of invalid items are kept in memory. Items are not loaded,
+        which allows to validate jobs of any size.
+
+        Args:
+            fast: report only the first error per item, see `glance()`
+            chunk_size: the number of items to read at once
+            See `validate_with_json_schema()` for other arguments descriptions.
+        """
+        if not isinstance(self.source, str) or not helpers.is_job_key(self.source):
+            raise ValueError(
+                f"'{self.source}' is not a job key, only jobs are streamed"
+            )
+        items = StreamingJobItems(
+            self.source, self.count, int(self.start or 0), self.filters, chunk_size
+        )
+        res = schema_rules.validate_stream(
+            self.schema.raw,
+            items.raw,
+            items.parse_keys,
+            fast=fast,
+            hybrid=hybrid,
+            memo_size=memo_size,
+        )
+        res.keys_url = items.keys_url
+        self.save_result(res)
+        self.report(res)
+
+    def validate_incrementally(
+        self, state_path: str, fast: bool = True, chunk_size: int = 10_000
+    ) -> None:
+        """Run JSON schema check only on job items which were added since the last
+        call with the same `state_path`, e.g. to watch running jobs. The state keeps
+        the next item index and all found errors, which are reported.
+        It starts over if the source, the schema or `fast` change.
+
+        Args:
+            state_path: a file to keep validation state in
+            fast: report only the first error per item, see `glance()`
+            chunk_size: the number of items to read at once
+        """
+        if not isinstance(self.source, str) or not helpers.is_job_key(self.source):
+            raise ValueError(
+                f"'{self.source}' is not a job key, only jobs are streamed"
+            )
+        if self.filters:
+            raise ValueError("Filtered items can't be validated incrementally")
+        state = schema_tools.ValidationState(
+            self.source,
+            schema_tools.schema_hash(self.schema.raw),
+            "fast" if fast else "full",
+        )
+        if os.path.exists(state_path):
+            saved_state = schema_tools.ValidationState.load(state_path)
+            if (saved_state.source, saved_state.schema_hash, saved_state.method) == (
+                state.source,
+                state.schema_hash,
+                state.method,
+            ):
+                state = saved_state
+
+        items = StreamingJobItems(
+            self.source, start_index=state.next_index, chunk_size=chunk_size
+        )
+        raw_items = items.raw if items.count > 0 else []
+        res = schema_rules.validate_incrementally(
+            self.schema.raw, raw_items, state, items.parse_keys
+        )
+        state.save(state_path)
+        res.keys_url = items.keys_url
+        self.save_result(res)
+        self.report(res)
+
     def run_schema_rules(self) -> None:
         if not self.schema:
             return
@@ -265,12 +462,20 @@ class Arche:
             price_rules.compare_names_for_same_urls,
             price_rules.compare_prices_for_same_names,
         ]:
-            self.save_result(r(source_items.df, target_items.df, tagged_fields))
-        self.save_result(
-            compare.tagged_fields(
-                source_items.df,
-                target_items.df,
-                tagged_fields,
-                ["product_url_field", "name_field"],
+            self.save_result(
+                r(
+                    source_items.df,
+                    target_items.df,
+                    tagged_fields,
+                    source_keys_url=source_items.keys_url,
+                    target_keys_url=target_items.keys_url,
+                )
             )
+        fields_result = compare.tagged_fields(
+            source_items.df,
+            target_items.df,
+            tagged_fields,
+            ["product_url_field", "name_field"],
         )
+        # missing values are reported with target keys
+        self.save_result(fields_result, target_items)
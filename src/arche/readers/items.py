@@ -1,9 +1,10 @@
 from abc import abstractmethod
-import numbers
-from typing import Any, Dict, Iterable, Optional
+import json
+from typing import Any, cast, Dict, Iterable, Iterator, Optional, Sequence, Set
 
 from arche import SH_URL
 from arche.tools import api
+from arche.tools.cache import Cache
 import numpy as np
 import pandas as pd
 from scrapinghub import ScrapinghubClient
@@ -14,32 +15,121 @@ RawItems = Iterable[Dict[str, Any]]
 
 
 class Items:
-    def __init__(self, raw: RawItems, df: pd.DataFrame):
-        self.raw = raw
+    # a url prefix to turn an index value into item url, see `CloudItems`
+    keys_url: Optional[str] = None
+
+    def __init__(self, raw: Optional[RawItems], df: pd.DataFrame):
+        """
+        Args:
+            raw: raw items. If None, they are rebuilt from `df` on access
+            df: a dataframe of items
+        """
+        self._raw = raw
         self.df = self.process_df(df)
 
+    @property
+    def raw(self) -> RawItems:
+        if self._raw is None:
+            return self.iter_raw()
+        return self._raw
+
+    def iter_raw(self, chunk_size: int = 10_000) -> Iterator[Dict[str, Any]]:
+        """Rebuild raw items from `df` one chunk at a time. Missing scalars like
+        `NaN` or `pd.NA` are skipped, so missing, null and empty values are all
+        missing fields.
+        Integer columns with missing values are float in `df`, so float columns
+        of whole numbers give back `int`."""
+        integers = {
+            c
+            for c in self.df.select_dtypes("float").columns
+            if (self.df[c].dropna() % 1 == 0).all()
+        }
+        for i in range(0, len(self.df), chunk_size):
+            for row in self.df.iloc[i : i + chunk_size].to_dict("records"):
+                item = {
+                    k: v.item() if isinstance(v, np.generic) else v
+                    for k, v in row.items()
+                    if not (pd.api.types.is_scalar(v) and pd.isna(v))
+                }
+                for k in integers.intersection(item):
+                    item[k] = int(item[k])
+                yield item
+
     def __len__(self) -> int:
         return len(self.df)
 
     @staticmethod
     def process_df(df: pd.DataFrame) -> pd.DataFrame:
-        # clean empty objects - mainly lists and dicts, but keep everything else
-        df = df.applymap(lambda x: x if x or isinstance(x, numbers.Real) else np.nan)
+        df = df.copy()
+        Items.clean_empty(df)
         Items.categorize(df)
         return df
 
     @staticmethod
-    def categorize(df: pd.DataFrame) -> pd.DataFrame:
-        """Cast columns with repeating values to `category` type to save memory"""
+    def clean_empty(df: pd.DataFrame) -> None:
+        """Replace empty objects - mainly lists, dicts and strings - with `NaN`
+        inplace, but keep everything else. Only object columns can hold them."""
+        for c in df.select_dtypes(include="object").columns:
+            values = df[c].values
+            empty = ~values.astype(bool)
+            if not empty.any():
+                continue
+            # falsy numbers (0, 0.0, False) are values
+            empty[empty] = values[empty] != 0
+            df[c] = df[c].mask(empty).infer_objects()
+
+    @staticmethod
+    def categorize(
+        df: pd.DataFrame, max_uniques: int = 10, sample_size: int = 5000
+    ) -> None:
+        """Cast columns with repeating values to `category` type to save memory.
+        Lists and dicts cannot be categories, so nested columns are kept as they are.
+
+        Args:
+            max_uniques: the maximum number of unique values, including `NaN`
+            sample_size: columns are filtered by a sample of this size first
+        """
         if len(df) < 100:
             return
+        sampled = df.sample(sample_size) if len(df) > sample_size else df
         for c in tqdm(df.columns, desc="Categorizing"):
+            if not Items.has_few_uniques(sampled[c], max_uniques):
+                continue
+            if not Items.has_few_uniques(df[c], max_uniques):
+                continue
+            df[c] = df[c].astype("category")
+
+    @staticmethod
+    def has_few_uniques(
+        values: pd.Series, max_uniques: int, chunk_size: int = 10_000
+    ) -> bool:
+        """Count unique values including `NaN` chunk by chunk, stopping as soon as
+        there are more than `max_uniques`. Nested values are unhashable, so columns
+        with them are not counted."""
+        uniques: Set = set()
+        has_na = False
+        for i in range(0, len(values), chunk_size):
+            chunk = values.iloc[i : i + chunk_size]
+            na = chunk.isna()
+            has_na = has_na or na.any()
+            chunk = chunk[~na]
             try:
-                if df[c].nunique(dropna=False) <= 10:
-                    df[c] = df[c].astype("category")
-            # ignore lists and dicts columns
+                uniques.update(pd.unique(chunk))
             except TypeError:
-                continue
+                return False
+            if len(uniques) + has_na > max_uniques:
+                return False
+        return True
+
+    def iter_chunks(self, chunk_size: int) -> Iterator["Items"]:
+        """Split items into consecutive pieces of at most `chunk_size` items."""
+        # raw items are kept as arrays or lists
+        raw = cast(Optional[Sequence[Dict[str, Any]]], self._raw)
+        for i in range(0, len(self), chunk_size):
+            yield Items(
+                raw=None if raw is None else raw[i : i + chunk_size],
+                df=self.df.iloc[i : i + chunk_size],
+            )
 
     @classmethod
     def from_df(cls, df: pd.DataFrame):
@@ -49,24 +139,108 @@ class Items:
     def from_array(cls, iterable: RawItems):
         return cls(raw=iterable, df=pd.DataFrame(list(iterable)))
 
+    @classmethod
+    def from_parquet(cls, path: str, arrow_strings: bool = False):
+        """Load items saved with `to_parquet()`. Raw items are rebuilt from df.
+
+        Args:
+            path: a parquet file path
+            arrow_strings: store string columns as `string[pyarrow]`,
+            see `use_arrow_strings()`
+        """
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(path)
+        meta = json.loads((table.schema.metadata or {}).get(b"arche", b"{}"))
+        df = table.to_pandas()
+        for c in meta.get("json_columns", []):
+            df[c] = df[c].map(json.loads, na_action="ignore")
+        items = cls(raw=None, df=df)
+        if meta.get("keys_url"):
+            items.keys_url = meta["keys_url"]
+        if arrow_strings:
+            items.use_arrow_strings()
+        return items
+
+    def to_parquet(self, path: str) -> None:
+        """Save df to a parquet file to run rules offline with `from_parquet()`.
+        Nested and mixed type columns are stored as json strings."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        json_columns = [
+            c
+            for c in self.df.select_dtypes(object).columns
+            if pd.api.types.infer_dtype(self.df[c], skipna=True)
+            not in ("string", "empty")
+        ]
+        df = self.df.assign(
+            **{c: self.df[c].map(json.dumps, na_action="ignore") for c in json_columns}
+        )
+        table = pa.Table.from_pandas(df)
+        meta = {"json_columns": json_columns, "keys_url": self.keys_url}
+        table = table.replace_schema_metadata(
+            {**table.schema.metadata, b"arche": json.dumps(meta).encode()}
+        )
+        pq.write_table(table, path)
+
+    def use_arrow_strings(self) -> "Items":
+        """Store string columns of df as `string[pyarrow]`, which takes a few times
+        less memory than python objects. Requires pandas>=1.3 and pyarrow."""
+        for c in self.df.select_dtypes(object).columns:
+            if pd.api.types.infer_dtype(self.df[c], skipna=True) == "string":
+                self.df[c] = self.df[c].astype("string[pyarrow]")
+        return self
+
+
+class CloudSource:
+    """Keys of Scrapy Cloud items, see `CloudItems` and `StreamingJobItems`"""
+
+    key: str
+
+    def parse_keys(self, keys: pd.Series) -> pd.Index:
+        raise NotImplementedError
+
+    def make_df(self, raw: RawItems) -> pd.DataFrame:
+        """Create a dataframe indexed by short item keys, without meta fields.
+        Urls are rendered only for output, see `CloudItems.format_keys()`"""
+        df = pd.DataFrame(list(raw))
+        df.index = self.parse_keys(df["_key"])
+        df.index.name = None
+        return df.drop(columns=["_key", "_type"], errors="ignore")
+
+
+class CloudItems(CloudSource, Items):
+    start: Optional[str]
+    keys_url: str
 
-class CloudItems(Items):
     def __init__(
         self,
         key: str,
+        keys_url: str,
         count: Optional[int] = None,
         filters: Optional[api.Filters] = None,
+        cache: Optional[Cache] = None,
+        keep_raw: bool = True,
+        fields: Optional[Iterable[str]] = None,
     ):
+        """
+        Args:
+            keys_url: a url prefix of items, see `format_keys()`
+            keep_raw: if False, raw items are released after the dataframe is built
+            and rebuilt from it on access, which halves memory usage
+            fields: read only these fields of items, see `Arche.get_rules_fields()`
+        """
         self.key = key
+        self.keys_url = keys_url
         self._count = count
         self._limit: int = 0
         self.filters = filters
-        raw = self.fetch_data()
-        df = pd.DataFrame(list(raw))
-        df.index = self.format_keys(df["_key"])
-        df.index.name = None
-        df = df.drop(columns=["_key", "_type"], errors="ignore")
-        super().__init__(raw=raw, df=df)
+        self.fields = fields
+        self.cache = cache
+        raw = self.fetch_cached_data(cache) if cache else self.fetch_data()
+        df = self.make_df(raw)
+        super().__init__(raw=raw if keep_raw else None, df=df)
 
     @property
     @abstractmethod
@@ -80,26 +254,39 @@ class CloudItems(Items):
         "The number of items users wants to retrieve"
         raise NotImplementedError
 
+    @property
     @abstractmethod
-    def fetch_data(self):
+    def cacheable(self) -> bool:
+        "If the data is not going to change and can be stored in cache"
         raise NotImplementedError
 
-    def format_keys(self, keys: pd.Series) -> pd.Series:
+    @abstractmethod
+    def fetch_data(self):
         raise NotImplementedError
 
+    def fetch_cached_data(self, cache: Cache) -> np.ndarray:
+        key = cache.make_key(
+            self.key, self.start, self.count, self.filters, self.fields
+        )
+        raw = cache.get(key)
+        if raw is None:
+            raw = self.fetch_data()
+            if self.cacheable:
+                cache.set(key, raw)
+        return raw
+
+    def format_keys(self, keys: pd.Index) -> pd.Index:
+        """Get Scrapy Cloud urls of items from the index values"""
+        return self.keys_url + keys.astype(str)
 
-class JobItems(CloudItems):
-    def __init__(
-        self,
-        key: str,
-        count: Optional[int] = None,
-        start_index: int = 0,
-        filters: Optional[api.Filters] = None,
-    ):
-        self.start_index = start_index
-        self.start: str = f"{key}/{start_index}"
-        self._job: Job = None
-        super().__init__(key, count, filters)
+
+class JobSource(CloudSource):
+    """Counts and keys of job items, see `JobItems` and `StreamingJobItems`"""
+
+    start_index: int
+    _count: Optional[int]
+    _limit: int
+    _job: Optional[Job]
 
     @property
     def limit(self) -> int:
@@ -122,20 +309,129 @@ class JobItems(CloudItems):
             self._job = job
         return self._job
 
+    def parse_keys(self, keys: pd.Series) -> pd.Index:
+        """Get item numbers from keys, e.g. 112358/13/21/5 to 5.
+        Items urls are `keys_url` followed by numbers,
+        e.g. https://app.scrapinghub.com/p/112358/13/21/item/5"""
+        return pd.Index(keys.str.rsplit("/", 1, expand=True)[1].astype(int))
+
+
+class JobItems(JobSource, CloudItems):
+    def __init__(
+        self,
+        key: str,
+        count: Optional[int] = None,
+        start_index: int = 0,
+        filters: Optional[api.Filters] = None,
+        cache: Optional[Cache] = None,
+        keep_raw: bool = True,
+        fields: Optional[Iterable[str]] = None,
+    ):
+        self.start_index = start_index
+        self.start: str = f"{key}/{start_index}"
+        self._job = None
+        super().__init__(
+            key, f"{SH_URL}/{key}/item/", count, filters, cache, keep_raw, fields
+        )
+
+    @property
+    def cacheable(self) -> bool:
+        return api.get_job_state(self.job) == "finished"
+
     def fetch_data(self) -> np.ndarray:
-        if self.filters or self.count < 200_000:
+        if self.count < 200_000:
             return api.get_items(
-                self.key, self.count, self.start_index, self.start, self.filters
+                self.key,
+                self.count,
+                self.start_index,
+                self.start,
+                self.filters,
+                fields=self.fields,
             )
+        elif self.filters:
+            # filtered items can be anywhere, so look through the rest of the job
+            return api.get_items_with_pool(
+                self.key,
+                self.limit - self.start_index,
+                self.start_index,
+                filters=self.filters,
+                fields=self.fields,
+            )[: self.count]
         else:
-            return api.get_items_with_pool(self.key, self.count, self.start_index)
+            return api.get_items_with_pool(
+                self.key, self.count, self.start_index, fields=self.fields
+            )
 
-    def format_keys(self, keys: pd.Series) -> pd.Series:
-        """Get Scrapy Cloud url to an item
-        E.g. 112358/13/21/0 to https://app.scrapinghub.com/p/112358/13/21/item/0"""
-        return (
-            SH_URL + "/" + self.key + "/item/" + keys.str.rsplit("/", 1, expand=True)[1]
-        )
+
+class StreamingJobItems(JobSource):
+    def __init__(
+        self,
+        key: str,
+        count: Optional[int] = None,
+        start_index: int = 0,
+        filters: Optional[api.Filters] = None,
+        chunk_size: int = 10_000,
+        fields: Optional[Iterable[str]] = None,
+    ):
+        """Job items which are read from API chunk by chunk on iteration, so the
+        whole job is never kept in memory. Hence they are not `Items` and have
+        no `df`, and `raw` reads items again on each access. Chunks are processed
+        separately, so the same column can be `category` in one chunk and `object`
+        in another.
+
+        Args:
+            chunk_size: the maximum number of items in a chunk
+        """
+        self.key = key
+        self.keys_url = f"{SH_URL}/{key}/item/"
+        self._count = count
+        self._limit = 0
+        self.filters = filters
+        self.fields = fields
+        self.start_index = start_index
+        self.start = f"{key}/{start_index}"
+        self._job = None
+        self.chunk_size = chunk_size
+
+    @property
+    def raw(self) -> Iterator[Dict[str, Any]]:
+        return self.iter_raw()
+
+    def __len__(self) -> int:
+        if self.filters:
+            # `count` only limits filtered items
+            raise TypeError("The number of filtered items is unknown until read")
+        return self.count
+
+    def __iter__(self) -> Iterator[Items]:
+        return self.iter_chunks()
+
+    def iter_chunks(self, chunk_size: Optional[int] = None) -> Iterator[Items]:
+        """Read items from API and yield them as `Items` of at most `chunk_size`"""
+        for raw in api.iter_items(
+            self.key,
+            self.count,
+            self.start_index,
+            self.start,
+            self.filters,
+            chunk_size=chunk_size or self.chunk_size,
+            fields=self.fields,
+        ):
+            yield Items(raw=raw, df=self.make_df(raw))
+
+    def iter_raw(self, chunk_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Read raw items from API keeping one chunk in memory at a time. Unlike
+        items of other sources, they have `_key` to tell them apart."""
+        for raw in api.iter_items(
+            self.key,
+            self.count,
+            self.start_index,
+            self.start,
+            self.filters,
+            chunk_size=chunk_size or self.chunk_size,
+            fields=self.fields,
+        ):
+            yield from raw
 
 
 class CollectionItems(CloudItems):
@@ -145,9 +441,17 @@ class CollectionItems(CloudItems):
         count: Optional[int] = None,
         start: Optional[str] = None,
         filters: Optional[api.Filters] = None,
+        cache: Optional[Cache] = None,
+        keep_raw: bool = True,
+        fields: Optional[Iterable[str]] = None,
     ):
         self.start = start
-        super().__init__(key, count, filters)
+        # collections can change, so they are cached only if it's asked for
+        if cache and not cache.collections:
+            cache = None
+        super().__init__(
+            key, f"{SH_URL}/{key}/", count, filters, cache, keep_raw, fields
+        )
 
     @property
     def limit(self) -> int:
@@ -161,14 +465,27 @@ class CollectionItems(CloudItems):
             self._count = self.limit
         return self._count
 
+    @property
+    def cacheable(self) -> bool:
+        return True
+
     def fetch_data(self) -> np.ndarray:
+        if self.count >= 200_000:
+            return api.get_collection_items_with_pool(
+                self.key, self.count, self.start, self.filters, fields=self.fields
+            )
         desc = f"Fetching from '{self.key.rsplit('/')[-1]}'"
         return api.get_items(
-            self.key, self.count, 0, self.start, self.filters, desc=desc
+            self.key,
+            self.count,
+            0,
+            self.start,
+            self.filters,
+            desc=desc,
+            fields=self.fields,
         )
 
-    def format_keys(self, keys: pd.Series) -> pd.Series:
-        """Get full Scrapy Cloud url from `_key`
-        E.g. be-006 to https://app.scrapinghub.com/p/collections/s/pages/be-006"""
-
-        return f"{SH_URL}/{self.key}/" + keys
+    def parse_keys(self, keys: pd.Series) -> pd.Index:
+        """Collection keys are kept as they are. Items urls are `keys_url` followed
+        by keys, e.g. https://app.scrapinghub.com/p/112358/collections/s/pages/be-006"""
+        return pd.Index(keys)
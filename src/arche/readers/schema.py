@@ -2,7 +2,7 @@ from collections import defaultdict
 from enum import Enum
 import json
 import pprint
-from typing import Dict, List, Union, Any, Set, DefaultDict
+from typing import Dict, Iterable, List, Union, Any, Set, DefaultDict
 
 from arche.tools import s3
 import perfect_jsonschema
@@ -47,6 +47,15 @@ class Schema:
                 enums.append(k)
         return enums
 
+    def get_fields(self, tags: Iterable[str]) -> List[str]:
+        """Get names of fields tagged with `tags`. Enums are category fields too."""
+        fields: List[str] = []
+        for tag in tags:
+            fields.extend(self.tags.get(tag, []))
+            if tag == Tag.category.name:
+                fields.extend(self.enums)
+        return list(dict.fromkeys(fields))
+
     @staticmethod
     def get_tags(schema: RawSchema) -> TaggedFields:
         tagged_fields: DefaultDict[str, List[str]] = defaultdict(list)
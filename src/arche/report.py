@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, Optional
 
 
 from arche import SH_URL
@@ -48,12 +48,15 @@ class Report:
         display_html(resultHTML, raw=True)
 
     @staticmethod
-    def sample_keys(keys: pd.Series, limit: int) -> str:
+    def sample_keys(keys: pd.Series, limit: int, keys_url: Optional[str] = None) -> str:
         if len(keys) > limit:
             sample = keys.sample(limit)
         else:
             sample = keys
 
+        if keys_url:
+            return ", ".join(sample.apply(lambda x: f"[{x}]({keys_url}{x})"))
+
         def url(x: str) -> str:
             if SH_URL in x:
                 return f"[{x.split('/')[-1]}]({x})"
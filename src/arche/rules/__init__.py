@@ -0,0 +1,12 @@
+from typing import Callable
+
+
+def reads(*tags: str) -> Callable:
+    """Declare schema tags of fields which a rule reads,
+    see `arche.Arche.get_rules_fields()`"""
+
+    def decorator(rule: Callable) -> Callable:
+        rule.tags = tags  # type: ignore
+        return rule
+
+    return decorator
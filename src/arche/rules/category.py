@@ -1,10 +1,12 @@
 from typing import List
 
+from arche.rules import reads
 from arche.rules.result import Outcome, Result
 import pandas as pd
 from tqdm.notebook import tqdm
 
 
+@reads("category")
 def get_difference(
     source_df: pd.DataFrame,
     target_df: pd.DataFrame,
@@ -59,6 +61,7 @@ def get_difference(
     return result
 
 
+@reads("category")
 def get_coverage_per_category(df: pd.DataFrame, category_names: List[str]) -> Result:
     """Get value counts per column, excluding nan.
 
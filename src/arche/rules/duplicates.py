@@ -1,11 +1,17 @@
-from collections import Iterable
-from typing import Any, Generator, List, Union
+from collections.abc import Iterable
+from typing import Any, Generator, List, Tuple, Union
 
 from arche.readers.schema import TaggedFields
+from arche.rules import reads
 from arche.rules.result import Result, Outcome
+import numpy as np
 import pandas as pd
 
 
+# the number of duplicated values to describe one by one, others are listed together
+MAX_DESCRIBED = 1000
+
+
 def find_by(df: pd.DataFrame, uniques: List[Union[str, List[str]]]) -> Result:
     """Find equal items rows in `df` by `uniques`. I.e. if two items have the same
     uniques's element value, they are considered duplicates.
@@ -23,22 +29,73 @@ def find_by(df: pd.DataFrame, uniques: List[Union[str, List[str]]]) -> Result:
     df = df.dropna(subset=list(set(flatten(uniques))), how="all")
     for columns in uniques:
         mask = columns if isinstance(columns, list) else [columns]
-        duplicates = df[df.duplicated(columns, keep=False)][mask]
-        if duplicates.empty:
+        values = df[mask].dropna()
+        positions, sizes = find_groups(hash_rows(values))
+        if not len(sizes):
             continue
 
+        keys = values.index.values[positions]
         errors = {}
-        grouped = duplicates.groupby(columns)
-        for _, d in grouped:
-            msgs = [f"'{d[c].iloc[0]}' `{c}`" for c in mask]
-            errors[f"same {', '.join(msgs)}"] = list(d.index)
+        end = 0
+        for size in sizes[:MAX_DESCRIBED]:
+            row = values.iloc[positions[end]]
+            msgs = [f"'{row[c]}' `{c}`" for c in mask]
+            errors[f"same {', '.join(msgs)}"] = keys[end : end + size]
+            end += size
+        if len(sizes) > MAX_DESCRIBED:
+            errors[
+                f"same {', '.join(mask)} in {len(sizes) - MAX_DESCRIBED} more values"
+            ] = keys[end:]
         result.add_error(
-            f"{', '.join(mask)} contains {len(grouped)} duplicated value(s)",
+            f"{', '.join(mask)} contains {len(sizes)} duplicated value(s)",
             errors=errors,
         )
     return result
 
 
+def hash_rows(df: pd.DataFrame) -> np.ndarray:
+    """Hash each row of `df` into uint64. Values are factorized first, so they are
+    equal as in `duplicated()`, e.g. 1 and "1" differ. Unhashable values like
+    lists are compared by their str."""
+    codes = {}
+    for column in df.columns:
+        try:
+            codes[column], _ = pd.factorize(df[column])
+        except TypeError:
+            codes[column], _ = pd.factorize(df[column].astype(str))
+    if len(codes) == 1:
+        return next(iter(codes.values())).astype(np.uint64)
+    return pd.util.hash_pandas_object(pd.DataFrame(codes), index=False).values
+
+
+def find_groups(hashes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Find groups of equal hashes with a single sort.
+
+    Returns:
+        Positions of duplicated hashes grouped together and sizes of these groups.
+        Groups are ordered by their first position, positions in a group ascend.
+    """
+    if not len(hashes):
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+    order = np.argsort(hashes, kind="mergesort")
+    sorted_hashes = hashes[order]
+    starts = np.flatnonzero(
+        np.concatenate([[True], sorted_hashes[1:] != sorted_hashes[:-1]])
+    )
+    sizes = np.diff(np.append(starts, len(hashes)))
+    group_ids = np.repeat(np.arange(len(starts)), sizes)
+    duplicated = (sizes > 1)[group_ids]
+    firsts = order[starts]
+    # a stable sort by first positions keeps groups together and ordered
+    positions = order[duplicated][
+        np.argsort(firsts[group_ids][duplicated], kind="mergesort")
+    ]
+    duplicated_groups = sizes > 1
+    sizes = sizes[duplicated_groups][np.argsort(firsts[duplicated_groups])]
+    return positions, sizes
+
+
+@reads("unique", "name_field", "product_url_field")
 def find_by_tags(df: pd.DataFrame, tagged_fields: TaggedFields) -> Result:
     """Check for duplicates based on schema tags. In particular, look for items with
     the same `name_field` and `product_url_field`, and for uniqueness among `unique` field"""
@@ -1,32 +1,118 @@
-import itertools
+from typing import Callable, Dict, Optional, Set
 
 from arche.readers.items import RawItems
 from arche.readers.schema import RawSchema, Tag, TaggedFields
-from arche.rules.result import Result
-from arche.tools.schema import fast_validate, full_validate
+from arche.rules.result import compact_keys, Keys, Result, union_keys
+from arche.tools.schema import (
+    columnar_validate,
+    fast_validate,
+    full_validate,
+    hybrid_validate,
+    stream_validate,
+    ValidationState,
+)
 import numpy as np
 import pandas as pd
 
 
 def validate(
-    schema: RawSchema, raw_items: RawItems, keys: pd.Index, fast: bool = False
+    schema: RawSchema,
+    raw_items: RawItems,
+    keys: pd.Index,
+    fast: bool = False,
+    workers: int = 1,
+    hybrid: bool = False,
+    memo_size: int = 0,
+    columnar: bool = False,
 ) -> Result:
     """Run JSON schema validation against data.
 
     Args:
         fast: defines if we use fastjsonschema or jsonschema validation
+        workers: the number of processes to validate items in
+        hybrid: find all errors with jsonschema only in items failed by
+        fastjsonschema, see `hybrid_validate()`
+        memo_size: the number of items to remember errors of, so identical items
+        are validated once
+        columnar: check simple properties by columns, see `columnar_validate()`
 
     Returns:
         Schema errors if any
     """
-    validate_func = fast_validate if fast else full_validate
-    errors = validate_func(schema, raw_items, keys)
+    if fast:
+        errors = fast_validate(schema, raw_items, keys, workers, memo_size)
+    elif columnar:
+        errors = columnar_validate(schema, raw_items, keys, workers, memo_size, hybrid)
+    else:
+        validate_func = hybrid_validate if hybrid else full_validate
+        errors = validate_func(schema, raw_items, keys, workers, memo_size)
+    return errors_result(errors, len(keys))
+
+
+def validate_stream(
+    schema: RawSchema,
+    raw_items: RawItems,
+    parse_keys: Optional[Callable[[pd.Series], pd.Index]] = None,
+    fast: bool = False,
+    hybrid: bool = False,
+    memo_size: int = 0,
+) -> Result:
+    """Run JSON schema validation against items as they are read, e.g. from
+    `StreamingJobItems.raw`, so only keys of invalid items are kept in memory.
+
+    Args:
+        raw_items: items with `_key`
+        parse_keys: a function to turn `_key` values into keys, e.g.
+        `JobItems.parse_keys()`
+        See `validate()` for other arguments descriptions.
+
+    Returns:
+        Schema errors if any
+    """
+    if fast:
+        method = "fast"
+    else:
+        method = "hybrid" if hybrid else "full"
+    errors, items_count = stream_validate(schema, raw_items, method, memo_size)
+    if parse_keys:
+        errors = {
+            message: set(parse_keys(pd.Series(list(keys))))
+            for message, keys in errors.items()
+        }
+    return errors_result(errors, items_count)
+
+
+def validate_incrementally(
+    schema: RawSchema,
+    raw_items: RawItems,
+    state: ValidationState,
+    parse_keys: Optional[Callable[[pd.Series], pd.Index]] = None,
+) -> Result:
+    """Validate items which follow `state.next_index` as they are read, and add
+    their errors to `state`. See `validate_stream()` for arguments descriptions.
+
+    Returns:
+        Schema errors of all validated items if any
+    """
+    errors, items_count = stream_validate(schema, raw_items, state.method)
+    for message, keys in errors.items():
+        if parse_keys:
+            keys = set(parse_keys(pd.Series(list(keys))))
+        state.errors.setdefault(message, set()).update(keys)
+    state.next_index += items_count
+    return errors_result(state.errors, state.next_index)
+
+
+def errors_result(errors: Dict[str, Set], items_count: int) -> Result:
     result = Result("JSON Schema Validation")
-    err_items = len(set(itertools.chain.from_iterable(errors.values())))
-    if errors:
+    compact: Dict[str, Keys] = {
+        message: compact_keys(keys) for message, keys in errors.items()
+    }
+    err_items = len(union_keys(compact.values()))
+    if compact:
         result.add_error(
-            f"{err_items} ({err_items/len(list(raw_items)):.0%}) items have {len(errors)} errors",  # noqa
-            errors=errors,
+            f"{err_items} ({err_items/items_count:.0%}) items have {len(compact)} errors",
+            errors=compact,
         )
     return result
 
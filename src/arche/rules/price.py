@@ -1,11 +1,14 @@
 from typing import Optional, List
 
 from arche.readers.schema import TaggedFields
+from arche.rules import reads
 from arche.rules.result import Result, Outcome
-from arche.tools.helpers import is_number, ratio_diff
+from arche.tools.helpers import ratio_diffs, to_floats
+import numpy as np
 import pandas as pd
 
 
+@reads("product_price_field", "product_price_was_field")
 def compare_was_now(df: pd.DataFrame, tagged_fields: TaggedFields):
     """Compare price_was and price_now tagged fields"""
 
@@ -21,56 +24,52 @@ def compare_was_now(df: pd.DataFrame, tagged_fields: TaggedFields):
 
     price_field = price_fields[0]
     price_was_field = price_was_fields[0]
-    prices = df.copy()
-    prices[price_was_field] = prices[price_was_field].astype(float)
-    prices[price_field] = prices[price_field].astype(float)
-
-    df_prices_less = pd.DataFrame(
-        prices[prices[price_was_field] < prices[price_field]],
-        columns=[price_was_field, price_field],
-    )
-
-    price_less_percent = "{:.2%}".format(len(df_prices_less) / items_number)
-
-    if not df_prices_less.empty:
-        error = f"Past price is less than current for {len(df_prices_less)} items"
+    price = df[price_field].astype(float).values
+    price_was = df[price_was_field].astype(float).values
+    with np.errstate(invalid="ignore"):
+        less = price_was < price
+        equal = price_was == price
+    less_count = np.count_nonzero(less)
+    equal_count = np.count_nonzero(equal)
+
+    if less_count:
+        price_less_percent = "{:.2%}".format(less_count / items_number)
+        error = f"Past price is less than current for {less_count} items"
         result.add_error(
-            f"{price_less_percent} ({len(df_prices_less)}) of "
+            f"{price_less_percent} ({less_count}) of "
             f"items with {price_was_field} < {price_field}",
-            errors={error: set(df_prices_less.index)},
+            errors={error: set(df.index[less])},
         )
 
-    df_prices_equals = pd.DataFrame(
-        prices[prices[price_was_field] == prices[price_field]],
-        columns=[price_was_field, price_field],
-    )
-    price_equal_percent = "{:.2%}".format(len(df_prices_equals) / items_number)
-
-    if not df_prices_equals.empty:
+    if equal_count:
+        price_equal_percent = "{:.2%}".format(equal_count / items_number)
         result.add_warning(
             (
-                f"{price_equal_percent} ({len(df_prices_equals)}) "
+                f"{price_equal_percent} ({equal_count}) "
                 f"of items with {price_was_field} = {price_field}"
             ),
-            errors=(
-                {
-                    f"Prices equal for {len(df_prices_equals)} items": set(
-                        df_prices_equals.index
-                    )
-                }
-            ),
+            errors={f"Prices equal for {equal_count} items": set(df.index[equal])},
         )
 
     result.items_count = len(df.index)
     return result
 
 
+@reads("product_url_field", "product_price_field")
 def compare_prices_for_same_urls(
-    source_df: pd.DataFrame, target_df: pd.DataFrame, tagged_fields: TaggedFields
+    source_df: pd.DataFrame,
+    target_df: pd.DataFrame,
+    tagged_fields: TaggedFields,
+    source_keys_url: Optional[str] = None,
+    target_keys_url: Optional[str] = None,
 ) -> Result:
     """For each pair of items that have the same `product_url_field` tagged field,
     compare `product_price_field` field
 
+    Args:
+        source_keys_url, target_keys_url: url prefixes to render keys of items
+        as urls in messages, see `arche.readers.items.CloudItems.keys_url`
+
     Returns:
         A result containing pairs of items from `source_df` and `target_df`
         which `product_price_field` differ.
@@ -95,28 +94,24 @@ def compare_prices_for_same_urls(
         result.add_info("product_price_field tag is not set")
     else:
         price_field = price_fields[0]
-        detailed_messages = []
-        for url in same_urls:
-            if url.strip() != "nan":
-                source_price = source_df[source_df[url_field] == url][price_field].iloc[
-                    0
-                ]
-                target_price = target_df[target_df[url_field] == url][price_field].iloc[
-                    0
-                ]
-
-                if (
-                    is_number(source_price)
-                    and is_number(target_price)
-                    and ratio_diff(source_price, target_price) > 0.1
-                ):
-                    source_key = source_df[source_df[url_field] == url].index[0]
-                    target_key = target_df[target_df[url_field] == url].index[0]
-                    msg = (
-                        f"different prices for url: {url}\nsource price is {source_price} "
-                        f"for {source_key}\ntarget price is {target_price} for {target_key}"
-                    )
-                    detailed_messages.append(msg)
+        urls = same_urls[same_urls.astype(str).str.strip() != "nan"].values
+        source_rows = first_rows(source_df, source_df[url_field], urls)
+        target_rows = first_rows(target_df, target_df[url_field], urls)
+        source_prices = source_rows[price_field].values
+        target_prices = target_rows[price_field].values
+        diffs = ratio_diffs(to_floats(source_prices), to_floats(target_prices))
+        with np.errstate(invalid="ignore"):
+            different = np.flatnonzero(diffs > 0.1)
+
+        source_keys = source_rows.index[different]
+        target_keys = target_rows.index[different]
+        detailed_messages = [
+            f"different prices for url: {urls[i]}\nsource price is {source_prices[i]} "
+            f"for {item_url(source_key, source_keys_url)}\n"
+            f"target price is {target_prices[i]} "
+            f"for {item_url(target_key, target_keys_url)}"
+            for i, source_key, target_key in zip(different, source_keys, target_keys)
+        ]
 
         res = f"{len(same_urls)} checked, {len(detailed_messages)} errors"
         if detailed_messages:
@@ -127,11 +122,21 @@ def compare_prices_for_same_urls(
     return result
 
 
+@reads("product_url_field", "name_field")
 def compare_names_for_same_urls(
-    source_df: pd.DataFrame, target_df: pd.DataFrame, tagged_fields: TaggedFields
+    source_df: pd.DataFrame,
+    target_df: pd.DataFrame,
+    tagged_fields: TaggedFields,
+    source_keys_url: Optional[str] = None,
+    target_keys_url: Optional[str] = None,
 ):
     """For each pair of items that have the same `product_url_field` tagged field,
-    compare `name_field` field"""
+    compare `name_field` field
+
+    Args:
+        source_keys_url, target_keys_url: url prefixes to render keys of items
+        as urls in messages, see `arche.readers.items.CloudItems.keys_url`
+    """
 
     result = Result("Compare Names Per Url")
     url_field_list: Optional[List[str]] = tagged_fields.get("product_url_field")
@@ -142,33 +147,37 @@ def compare_names_for_same_urls(
 
     name_field: str = name_field_list[0]
     url_field: str = url_field_list[0]
-    diff_names_count = 0
+
+    source_df = source_df.dropna(subset=[url_field])
+    target_df = target_df.dropna(subset=[url_field])
 
     same_urls = source_df[(source_df[url_field].isin(target_df[url_field].values))][
         url_field
     ]
 
-    detailed_messages = []
-    for url in same_urls:
-        if url.strip() != "nan":
-            source_name = source_df[source_df[url_field] == url][name_field].iloc[0]
-            target_name = target_df[target_df[url_field] == url][name_field].iloc[0]
-
-            if (
-                source_name != target_name
-                and source_name.strip() != "nan"
-                and target_name.strip() != "nan"
-            ):
-                diff_names_count += 1
-                source_key = source_df[source_df[url_field] == url].index[0]
-                target_key = target_df[target_df[url_field] == url].index[0]
-                msg = (
-                    f"different names for url: {url}\nsource name is {source_name} "
-                    f"for {source_key}\ntarget name is {target_name} for {target_key}"
-                )
-                detailed_messages.append(msg)
-
-    res = f"{len(same_urls)} checked, {diff_names_count} errors"
+    urls = same_urls[same_urls.astype(str).str.strip() != "nan"].values
+    source_rows = first_rows(source_df, source_df[url_field], urls)
+    target_rows = first_rows(target_df, target_df[url_field], urls)
+    source_names = source_rows[name_field]
+    target_names = target_rows[name_field]
+    different = np.flatnonzero(
+        (
+            np.asarray(source_names, dtype=object)
+            != np.asarray(target_names, dtype=object)
+        )
+        & (source_names.astype(str).str.strip() != "nan").values
+        & (target_names.astype(str).str.strip() != "nan").values
+    )
+
+    detailed_messages = [
+        f"different names for url: {urls[i]}\nsource name is {source_names.iat[i]} "
+        f"for {item_url(source_names.index[i], source_keys_url)}\n"
+        f"target name is {target_names.iat[i]} "
+        f"for {item_url(target_names.index[i], target_keys_url)}"
+        for i in different
+    ]
+
+    res = f"{len(same_urls)} checked, {len(different)} errors"
     if detailed_messages:
         result.add_error(res, detailed="\n".join(detailed_messages))
     else:
@@ -177,9 +186,24 @@ def compare_names_for_same_urls(
     return result
 
 
+@reads("name_field", "product_price_field")
 def compare_prices_for_same_names(
-    source_df: pd.DataFrame, target_df: pd.DataFrame, tagged_fields: TaggedFields
+    source_df: pd.DataFrame,
+    target_df: pd.DataFrame,
+    tagged_fields: TaggedFields,
+    normalize: bool = False,
+    source_keys_url: Optional[str] = None,
+    target_keys_url: Optional[str] = None,
 ):
+    """For each pair of items that have the same `name_field` tagged field,
+    compare `product_price_field` field
+
+    Args:
+        normalize: if set, names are converted to str, lowercased and their
+        whitespaces are collapsed before matching
+        source_keys_url, target_keys_url: url prefixes to render keys of items
+        as urls in messages, see `arche.readers.items.CloudItems.keys_url`
+    """
     result = Result("Compare Prices For Same Names")
     name_field_tag = tagged_fields.get("name_field")
     if not name_field_tag:
@@ -189,10 +213,13 @@ def compare_prices_for_same_names(
     name_field = name_field_tag[0]
     source_df = source_df[source_df[name_field].notnull()]
     target_df = target_df[target_df[name_field].notnull()]
+    source_names = source_df[name_field]
+    target_names = target_df[name_field]
+    if normalize:
+        source_names = normalize_names(source_names)
+        target_names = normalize_names(target_names)
 
-    same_names = source_df[(source_df[name_field].isin(target_df[name_field].values))][
-        name_field
-    ]
+    same_names = source_names[source_names.isin(target_names.values)]
 
     price_fields = tagged_fields.get("product_price_field")
     if not price_fields:
@@ -200,20 +227,22 @@ def compare_prices_for_same_names(
         return result
     price_field = price_fields[0]
 
-    detailed_messages = []
-    for name in same_names:
-        if name.strip() != "nan":
-            source_price = source_df[source_df[name_field] == name][price_field].iloc[0]
-            target_price = target_df[target_df[name_field] == name][price_field].iloc[0]
-            if is_number(source_price) and is_number(target_price):
-                if ratio_diff(source_price, target_price) > 0.1:
-                    source_key = source_df[source_df[name_field] == name].index[0]
-                    target_key = target_df[target_df[name_field] == name].index[0]
-                    msg = (
-                        f"different price for {name}\nsource price is {source_price} "
-                        f"for {source_key}\ntarget price is {target_price} for {target_key}"
-                    )
-                    detailed_messages.append(msg)
+    names = same_names[same_names.astype(str).str.strip() != "nan"].values
+    source_prices = first_rows(source_df, source_names, names)[price_field]
+    target_prices = first_rows(target_df, target_names, names)[price_field]
+    diffs = ratio_diffs(
+        to_floats(source_prices.values), to_floats(target_prices.values)
+    )
+    with np.errstate(invalid="ignore"):
+        different = np.flatnonzero(diffs > 0.1)
+
+    detailed_messages = [
+        f"different price for {names[i]}\nsource price is {source_prices.iat[i]} "
+        f"for {item_url(source_prices.index[i], source_keys_url)}\n"
+        f"target price is {target_prices.iat[i]} "
+        f"for {item_url(target_prices.index[i], target_keys_url)}"
+        for i in different
+    ]
 
     result_msg = f"{len(same_names)} checked, {len(detailed_messages)} errors"
     if detailed_messages:
@@ -222,3 +251,22 @@ def compare_prices_for_same_names(
         result.add_info(result_msg)
 
     return result
+
+
+def item_url(key, keys_url: Optional[str]) -> str:
+    """Render a key of an item as its url if `keys_url` is known"""
+    return f"{keys_url}{key}" if keys_url else str(key)
+
+
+def normalize_names(names: pd.Series) -> pd.Series:
+    """Lowercase names and collapse their whitespaces"""
+    return (
+        names.astype(str).str.lower().str.replace(r"\s+", " ", regex=True).str.strip()
+    )
+
+
+def first_rows(df: pd.DataFrame, keys: pd.Series, values: np.ndarray) -> pd.DataFrame:
+    """Get the first row of `df` with each of `values` in `keys`, looking them up
+    in a hash index of unique keys. `values` must be present in `keys`."""
+    first = ~keys.duplicated().values
+    return df[first].iloc[pd.Index(keys.values[first]).get_indexer(values)]
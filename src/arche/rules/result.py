@@ -2,7 +2,7 @@ from dataclasses import dataclass, field
 from enum import Enum
 import itertools
 import math
-from typing import Dict, List, Optional, Set, Union
+from typing import cast, Dict, Iterable, List, Optional, Set, Union
 
 import IPython
 import numpy as np
@@ -12,9 +12,46 @@ import plotly.io as pio
 from plotly.subplots import make_subplots
 
 Stat = Union[pd.Series, pd.DataFrame]
+Keys = Union[Set, List, np.ndarray]
 COLORS = pio.templates["seaborn"]["layout"]["colorway"]
 
 
+def compact_keys(keys: Keys) -> Keys:
+    """Store integer keys as a sorted array of unique int32 (or int64 if they don't
+    fit) positions, which takes ~4 bytes per key instead of ~60 in a set.
+    Other keys, e.g. `_key` of collections, are returned as they are."""
+    values = np.asarray(list(keys) if isinstance(keys, (set, frozenset)) else keys)
+    if not values.size or values.dtype.kind not in "iu":
+        return keys
+    unique: np.ndarray = np.unique(values)
+    if unique[-1] <= np.iinfo(np.int32).max and unique[0] >= 0:
+        return unique.astype(np.int32)
+    return unique.astype(np.int64)
+
+
+def union_keys(keys: Iterable[Keys]) -> Keys:
+    keys_list: List[Keys] = list(keys)
+    if keys_list and all(isinstance(k, np.ndarray) for k in keys_list):
+        return np.unique(np.concatenate(cast(List[np.ndarray], keys_list)))
+    return set(itertools.chain.from_iterable(keys_list))
+
+
+def keys_equal(left: Keys, right: Keys) -> bool:
+    if isinstance(left, np.ndarray) or isinstance(right, np.ndarray):
+        return np.array_equal(
+            np.asarray(compact_keys(left)), np.asarray(compact_keys(right))
+        )
+    return left == right
+
+
+def errors_equal(left: Optional[Dict], right: Optional[Dict]) -> bool:
+    if not left or not right:
+        return left == right
+    return left.keys() == right.keys() and all(
+        keys_equal(keys, right[e]) for e, keys in left.items()
+    )
+
+
 class Level(Enum):
     ERROR = 2
     WARNING = 1
@@ -46,19 +83,33 @@ class Message:
     Args:
         summary: a concise outcome
         detailed: detailed message
-        errors: error messages grouped by attributes
+        errors: error messages grouped by attributes. Integer keys are stored
+        as sorted arrays, see `compact_keys()`
         _err_keys: keys of items with error
     """
 
     summary: str
     detailed: Optional[str] = None
-    errors: Optional[Dict[str, Set]] = None
-    _err_keys: Set[Union[str, int]] = field(default_factory=set)
+    errors: Optional[Dict[str, Keys]] = None
+    _err_keys: Keys = field(default_factory=set)
+
+    def __post_init__(self):
+        if self.errors:
+            self.errors = {e: compact_keys(keys) for e, keys in self.errors.items()}
+
+    def __eq__(self, other):
+        if not isinstance(other, Message):
+            return NotImplemented
+        return (
+            self.summary == other.summary
+            and self.detailed == other.detailed
+            and errors_equal(self.errors, other.errors)
+        )
 
     @property
-    def err_keys(self):
-        if not self._err_keys and self.errors:
-            self._err_keys = set(itertools.chain.from_iterable(self.errors.values()))
+    def err_keys(self) -> Keys:
+        if not len(self._err_keys) and self.errors:
+            self._err_keys = union_keys(self.errors.values())
 
         return self._err_keys
 
@@ -74,6 +125,7 @@ class Result:
         err_keys: keys of all error items
         err_items_count: the number of error items
         _figures: a list of graphs created from stats
+        keys_url: a url prefix which turns item keys into links
     """
 
     name: str
@@ -81,10 +133,11 @@ class Result:
     _stats: List[Stat] = field(default_factory=list)
     more_stats: Dict[str, Dict] = field(default_factory=dict)
     items_count: int = 0
-    _err_keys: Set[Union[str, int]] = field(default_factory=set)
+    _err_keys: Keys = field(default_factory=set, compare=False)
     _err_items_count: int = 0
     _figures: List[go.FigureWidget] = field(default_factory=list)
     _outcome: Optional[Outcome] = None
+    keys_url: Optional[str] = field(default=None, compare=False)
 
     @property
     def info(self):
@@ -126,13 +179,11 @@ class Result:
         self._stats = value
 
     @property
-    def err_keys(self):
-        if not self._err_keys:
+    def err_keys(self) -> Keys:
+        if not len(self._err_keys):
             err_messages = self.messages.get(Level.ERROR)
             if err_messages:
-                self._err_keys = set(
-                    itertools.chain.from_iterable([m.err_keys for m in err_messages])
-                )
+                self._err_keys = union_keys(m.err_keys for m in err_messages)
         return self._err_keys
 
     @property
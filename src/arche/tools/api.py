@@ -1,9 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from functools import partial
+import itertools
 import math
-from multiprocessing import Pool
 import time
-from typing import Dict, List, Tuple, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Optional, Union
 
 from arche.tools import helpers
 from dateutil.relativedelta import relativedelta
@@ -129,35 +129,181 @@ def get_source(source_key):
         return ScrapinghubClient().get_job(source_key).items
 
 
+def iter_source(
+    source_key: str,
+    start: Optional[str],
+    count: Optional[int],
+    filters: Optional[Filters] = None,
+    fields: Optional[Iterable[str]] = None,
+    source: Any = None,
+    **kwargs,
+) -> Iterator[Dict[str, Any]]:
+    """Iterate over items of a job or a collection with their `_key`.
+
+    Args:
+        fields: keep only these fields of items. The projection is applied as
+        items are read, so other fields are never accumulated
+        source: job items or a collection from `get_source()` to reuse its client
+    """
+    if source is None:
+        source = get_source(source_key)
+    items_iter = source.iter(
+        start=start, count=count, filter=filters, meta="_key", **kwargs
+    )
+    if fields is None:
+        return items_iter
+    projection = set(fields) | {"_key"}
+    return ({k: v for k, v in i.items() if k in projection} for i in items_iter)
+
+
 def get_items_with_pool(
-    source_key: str, count: int, start_index: int, workers: int = 4
+    source_key: str,
+    count: int,
+    start_index: int,
+    workers: int = 4,
+    filters: Optional[Filters] = None,
+    fields: Optional[Iterable[str]] = None,
+    p_bar: Union[tqdm, notebook.tqdm] = notebook.tqdm,
 ) -> np.ndarray:
-    """Concurrently reads items from API using Pool
+    """Concurrently reads job items from API, see `read_ranges()`.
 
     Args:
-        source_key: a job or collection key, e.g. '112358/13/21'
-        count: a number of items to retrieve
+        source_key: a job key, e.g. '112358/13/21'
+        count: a number of items to retrieve. With `filters`, the number of items
+        to look through
         start_index: an index to read from
-        workers: the number of separate processors to get data in
+        workers: the number of concurrent connections to get data with
+        filters: Scrapinghub filtering, applied to each range
+        fields: read only these fields, see `iter_source()`
 
     Returns:
         A numpy array of items
     """
-    active_connections_limit = 10
-    processes_count: int = min(
-        max(helpers.cpus_count() or 0, workers), active_connections_limit
+    connections_count = get_connections_count(workers)
+    batch_size = max(math.ceil(count / connections_count), 1)
+    ranges = [
+        (f"{source_key}/{i}", min(batch_size, start_index + count - i))
+        for i in range(start_index, start_index + count, batch_size)
+    ]
+    return read_ranges(
+        source_key,
+        ranges,
+        filters,
+        fields,
+        connections_count,
+        p_bar,
+        desc=f"Fetching {start_index}:{start_index+count} from {source_key}",
     )
 
-    batch_size = math.ceil(count / processes_count)
 
-    start_idxs = range(start_index, start_index + count, batch_size)
-    start = [f"{source_key}/{i}" for i in start_idxs]
-    with Pool(processes_count) as p:
-        results = p.starmap(
-            partial(get_items, source_key, batch_size, p_bar=tqdm),
-            zip(start_idxs, start),
+def get_collection_items_with_pool(
+    source_key: str,
+    count: int,
+    start: Optional[str] = None,
+    filters: Optional[Filters] = None,
+    workers: int = 4,
+    fields: Optional[Iterable[str]] = None,
+    p_bar: Union[tqdm, notebook.tqdm] = notebook.tqdm,
+) -> np.ndarray:
+    """Concurrently reads collection items from API. Collections are sorted by keys,
+    so keys are read first to split the collection into ranges
+    starting at checkpoint keys, see `read_ranges()`.
+
+    Returns:
+        A numpy array of items
+    """
+    keys = [
+        item["_key"]
+        for item in get_source(source_key).iter(
+            start=start, count=count, filter=filters, meta=["_key"], nodata=True
         )
-        return np.concatenate(results)
+    ]
+    connections_count = get_connections_count(workers)
+    batch_size = max(math.ceil(len(keys) / connections_count), 1)
+    ranges = [
+        (keys[i], min(batch_size, len(keys) - i))
+        for i in range(0, len(keys), batch_size)
+    ]
+    return read_ranges(
+        source_key,
+        ranges,
+        filters,
+        fields,
+        connections_count,
+        p_bar,
+        desc=f"Fetching from '{source_key.rsplit('/')[-1]}'",
+    )
+
+
+def get_connections_count(workers: int) -> int:
+    active_connections_limit = 10
+    return min(max(helpers.cpus_count() or 0, workers), active_connections_limit)
+
+
+def read_ranges(
+    source_key: str,
+    ranges: List[Tuple[str, int]],
+    filters: Optional[Filters] = None,
+    fields: Optional[Iterable[str]] = None,
+    connections_count: int = 4,
+    p_bar: Union[tqdm, notebook.tqdm] = notebook.tqdm,
+    desc: Optional[str] = None,
+) -> np.ndarray:
+    """Read `(start, count)` ranges concurrently. Connections run in threads of
+    the current process and write items straight into the resulting array,
+    so nothing is pickled or concatenated.
+
+    Filtered job items per range are unknown beforehand, so a range is read
+    until the first item outside of it.
+
+    Returns:
+        A numpy array of items ordered as ranges
+    """
+    filtered_job = bool(filters) and helpers.is_job_key(source_key)
+    counts = [count for _, count in ranges]
+    offsets = np.cumsum([0] + counts[:-1])
+    items = np.empty(0 if filtered_job else sum(counts), dtype=object)
+    batches: List[List] = [[] for _ in ranges]
+    progress = None
+    if p_bar:
+        progress = p_bar(
+            desc=desc, total=None if filtered_job else sum(counts), unit_scale=1
+        )
+
+    # one client serves all connections
+    source = get_source(source_key)
+
+    def read(i: int) -> int:
+        start, count = ranges[i]
+        items_iter = iter_source(source_key, start, count, filters, fields, source)
+        read_count = 0
+        stop_index = int(start.rsplit("/", 1)[-1]) + count if filtered_job else 0
+        for item in items_iter:
+            if filtered_job:
+                if int(item["_key"].rsplit("/", 1)[-1]) >= stop_index:
+                    break
+                batches[i].append(item)
+            else:
+                items[offsets[i] + read_count] = item
+            read_count += 1
+            if progress:
+                progress.update()
+        return read_count
+
+    with ThreadPoolExecutor(connections_count) as executor:
+        read_counts = list(executor.map(read, range(len(ranges))))
+    if progress:
+        progress.close()
+
+    if filtered_job:
+        items = np.empty(sum(read_counts), dtype=object)
+        offsets = np.cumsum([0] + read_counts[:-1])
+        for i, (offset, read_count) in enumerate(zip(offsets, read_counts)):
+            items[offset : offset + read_count] = batches[i]
+            batches[i] = []
+    elif sum(read_counts) < len(items):
+        return np.concatenate([items[o : o + c] for o, c in zip(offsets, read_counts)])
+    return items
 
 
 def get_items(
@@ -168,12 +314,48 @@ def get_items(
     filters: Optional[Filters] = None,
     p_bar: Union[tqdm, notebook.tqdm] = notebook.tqdm,
     desc: Optional[str] = None,
+    fields: Optional[Iterable[str]] = None,
 ) -> np.ndarray:
-    source = get_source(key)
-    items_iter = source.iter(start=start, count=count, filter=filters, meta="_key")
+    items_iter = iter_source(key, start, count, filters, fields)
 
     if p_bar:
         if not desc:
             desc = f"Fetching {start_index}:{start_index+count} from {key}"
         items_iter = p_bar(items_iter, desc=desc, total=count, unit_scale=1)
     return np.asarray(list(items_iter))
+
+
+def iter_items(
+    key: str,
+    count: int,
+    start_index: int,
+    start: Optional[str],
+    filters: Optional[Filters] = None,
+    chunk_size: int = 10_000,
+    p_bar: Union[tqdm, notebook.tqdm] = notebook.tqdm,
+    desc: Optional[str] = None,
+    fields: Optional[Iterable[str]] = None,
+) -> Iterator[np.ndarray]:
+    """Read items from API lazily, keeping only one chunk in memory at a time.
+
+    Args:
+        count: the maximum number of items, there are fewer if `filters` are set
+        chunk_size: the maximum number of items in a chunk
+        fields: read only these fields, see `iter_source()`
+
+    Yields:
+        Numpy arrays of at most `chunk_size` items
+    """
+    items_iter = iter_source(key, start, count, filters, fields)
+
+    if p_bar:
+        if not desc:
+            desc = f"Streaming {start_index}:{start_index+count} from {key}"
+        items_iter = p_bar(
+            items_iter, desc=desc, total=None if filters else count, unit_scale=1
+        )
+    while True:
+        chunk = list(itertools.islice(items_iter, chunk_size))
+        if not chunk:
+            return
+        yield np.asarray(chunk)
@@ -0,0 +1,128 @@
+import contextlib
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import tempfile
+from typing import Any, Dict, Iterable, List, Optional
+
+import msgpack
+import numpy as np
+
+
+DEFAULT_PATH = "~/.cache/arche"
+logger = logging.getLogger("arche")
+
+
+def get_path(path: Optional[str] = None) -> Path:
+    """Get the cache directory, `path` or `ARCHE_CACHE_DIR` environment variable
+    or `~/.cache/arche`"""
+    path = path or os.environ.get("ARCHE_CACHE_DIR") or DEFAULT_PATH
+    return Path(path).expanduser()
+
+
+class Cache:
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_size: int = 10 * 1024**3,
+        collections: bool = False,
+    ):
+        """A local storage of fetched items, one msgpack file per read.
+
+        Args:
+            path: a directory to store items in. Defaults to `ARCHE_CACHE_DIR`
+            environment variable or `~/.cache/arche`
+            max_size: the cache size limit in bytes. When exceeded, the least
+            recently used entries are removed
+            collections: store collections items too. Collections can change,
+            so cached items may be outdated until they are `invalidate()`d
+        """
+        self.path = get_path(path)
+        self.max_size = max_size
+        self.collections = collections
+
+    @staticmethod
+    def make_key(
+        source_key: str,
+        start: Any,
+        count: int,
+        filters: Optional[List] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> str:
+        """Create a file name unique to the read parameters,
+        e.g. 112358_13_21-3a9e...c1"""
+        params: List[Any] = [source_key, start, count, filters]
+        if fields is not None:
+            params.append(sorted(fields))
+        digest = hashlib.sha1(json.dumps(params, default=str).encode()).hexdigest()
+        return f"{source_key.replace('/', '_')}-{digest}"
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        path = self.path / f"{key}.msgpack"
+        if not path.exists():
+            return None
+        try:
+            items = self.read(path)
+        except (OSError, ValueError):
+            # a broken entry is a miss, so items are fetched and cached again
+            logger.warning(f"Removing a broken cache entry {path}")
+            with contextlib.suppress(OSError):
+                path.unlink()
+            return None
+        # the access time is not reliable, so modification time tracks usage
+        os.utime(path)
+        return np.asarray(items)
+
+    @staticmethod
+    def read(path: Path) -> List[Dict[str, Any]]:
+        """Read items from a msgpack file. Unpacking stops silently at a truncated
+        item, so the file must be read to its end."""
+        items = []
+        end = 0
+        with path.open("rb") as f:
+            unpacker = msgpack.Unpacker(f, raw=False)
+            for item in unpacker:
+                items.append(item)
+                end = unpacker.tell()
+        if end != path.stat().st_size:
+            raise ValueError(f"{path} is truncated")
+        return items
+
+    def set(self, key: str, items: Iterable[Dict[str, Any]]) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        path = self.path / f"{key}.msgpack"
+        packer = msgpack.Packer()
+        # a unique file, so concurrent writers don't rename each other's files
+        with tempfile.NamedTemporaryFile(
+            "wb", dir=self.path, suffix=".tmp", delete=False
+        ) as f:
+            for item in items:
+                f.write(packer.pack(item))
+        os.replace(f.name, path)
+        self.evict()
+
+    @property
+    def size(self) -> int:
+        return sum(p.stat().st_size for p in self.path.glob("*.msgpack"))
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the cache fits `max_size`"""
+        entries = sorted(self.path.glob("*.msgpack"), key=lambda p: p.stat().st_mtime)
+        size = sum(p.stat().st_size for p in entries)
+        for path in entries:
+            if size <= self.max_size:
+                break
+            size -= path.stat().st_size
+            path.unlink()
+
+    def invalidate(self, source_key: Optional[str] = None) -> None:
+        """Remove cached items of `source_key`, or everything if it's not set."""
+        if source_key:
+            # a key is followed by '-' and 40 hexdigits of sha1
+            pattern = f"{source_key.replace('/', '_')}-{'?' * 40}.msgpack"
+        else:
+            pattern = "*.msgpack"
+        for path in self.path.glob(pattern):
+            path.unlink()
@@ -2,6 +2,8 @@ import datetime as d
 import os
 from typing import Optional
 
+import numpy as np
+
 
 class CollectionKey:
     def __init__(self, project_key, store_key):
@@ -58,6 +60,28 @@ def ratio_diff(source, target):
     return round((source - target) / source, 2)
 
 
+def ratio_diffs(source: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """Return differences in ratio between two float arrays like `ratio_diff()`,
+    NaN values give NaN differences"""
+    both_zero = (source == 0) & (target == 0)
+    source = np.where(source == 0, 0.000_000_000_000_01, source)
+    greater, less = np.maximum(source, target), np.minimum(source, target)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        diffs = np.round((greater - less) / greater, 2)
+    diffs[both_zero] = 0
+    return diffs
+
+
+def to_floats(values: np.ndarray) -> np.ndarray:
+    """Convert values to floats, NaN for values which are not numbers,
+    see `is_number()`"""
+    if values.dtype.kind in "biuf":
+        return values.astype(float)
+    return np.fromiter(
+        (float(v) if is_number(v) else np.nan for v in values), float, len(values)
+    )
+
+
 def to_float_or_zero(value):
     if value:
         return float(value)
@@ -1,33 +1,77 @@
-from collections import defaultdict
+from collections import defaultdict, deque, OrderedDict
+import contextlib
+from dataclasses import asdict, dataclass, field
+import hashlib
+import itertools
+import json
+import logging
+import math
+import multiprocessing
+import os
+from pathlib import Path
 import random
-from typing import Any, DefaultDict, Deque, Dict, List, Optional
+import tempfile
+from typing import (
+    Any,
+    Callable,
+    DefaultDict,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 from arche.readers.items import RawItems
-from arche.readers.schema import RawSchema, Schema, SchemaObject
+from arche.readers.schema import EXTENDED_KEYWORDS, RawSchema, Schema, SchemaObject
 from arche.schema_definitions import extension
-from arche.tools import api, helpers
+from arche.tools import api, cache, helpers
 import fastjsonschema
 from genson import SchemaBuilder
 from jsonschema import FormatChecker, validators
+import numpy as np
 import pandas as pd
 from tqdm.notebook import tqdm
 
 
-def basic_json_schema(data_source: str, items_numbers: List[int] = None) -> Schema:
+logger = logging.getLogger("arche")
+# fields added to items by Scrapy Cloud, which are not validated
+META_FIELDS = ("_type", "_key")
+# top level keywords which don't tell meta fields apart once `ignore_meta()` allows them
+META_BLIND_KEYWORDS = {
+    "type",
+    "properties",
+    "required",
+    "additionalProperties",
+    "definitions",
+    "$defs",
+}
+
+
+def basic_json_schema(
+    data_source: str, items_numbers: List[int] = None, sample_size: int = 4
+) -> Schema:
     """Print a json schema based on the provided job_key and item numbers
 
     Args:
         data_source: a collection or job key
         items_numbers: array of item numbers to create schema from
+        sample_size: the number of random items to sample if `items_numbers`
+        are not set. Hundreds of items give more representative schemas
     """
-    schema = create_json_schema(data_source, items_numbers)
+    schema = create_json_schema(data_source, items_numbers, sample_size)
     return Schema(schema)
 
 
 def create_json_schema(
-    source_key: str, items_numbers: Optional[List[int]] = None
+    source_key: str,
+    items_numbers: Optional[List[int]] = None,
+    sample_size: int = 4,
+    connections_count: int = 4,
 ) -> RawSchema:
-    """Create schema based on sampled `source_key` items."""
+    """Create schema based on sampled `source_key` items. Consecutive item
+    numbers are read as one range and ranges are read concurrently."""
     if helpers.is_collection_key(source_key):
         store = api.get_collection(source_key)
         items_count = store.count()
@@ -41,22 +85,30 @@ def create_json_schema(
     if items_count == 0:
         raise ValueError(f"'{source_key}' does not have any items")
 
-    items_numbers = items_numbers or set_item_no(items_count)
+    items_numbers = items_numbers or set_item_no(items_count, sample_size)
     if max(items_numbers) >= items_count or min(items_numbers) < 0:
         raise ValueError(
             f"Expected values between 0 and {items_count}, got '{items_numbers}'"
         )
 
-    samples = []
-    for n in items_numbers:
-        item = api.get_items(
-            source_key, count=1, start_index=n, start=f"{start_mask}{n}", p_bar=None
-        )[0]
-        item.pop("_type", None)
-        item.pop("_key", None)
-        samples.append(item)
+    ranges = [(f"{start_mask}{n}", count) for n, count in to_ranges(items_numbers)]
+    items = api.read_ranges(
+        source_key,
+        ranges,
+        connections_count=connections_count,
+        p_bar=tqdm if len(items_numbers) > 100 else None,
+        desc=f"Sampling {len(items_numbers)} items from {source_key}",
+    )
+    return infer_schema([without_meta(item) for item in items])
+
 
-    return infer_schema(samples)
+def to_ranges(numbers: List[int]) -> List[Tuple[int, int]]:
+    """Group unique numbers into `(start, count)` ranges of consecutive numbers"""
+    unique = np.unique(numbers)
+    breaks = np.flatnonzero(np.diff(unique) != 1) + 1
+    starts = np.concatenate([[0], breaks])
+    counts = np.diff(np.concatenate([starts, [len(unique)]]))
+    return [(int(unique[s]), int(c)) for s, c in zip(starts, counts)]
 
 
 def infer_schema(samples: List[Dict[str, Any]]) -> RawSchema:
@@ -81,19 +133,24 @@ def extend_schema(schema: SchemaObject) -> None:
             extend_schema(v)
 
 
-def set_item_no(items_count: int) -> List[int]:
+def set_item_no(items_count: int, sample_size: int = 4) -> List[int]:
     """Generate random numbers within items_count range
 
     Returns:
-        4 random numbers if items_count > 4 otherwise items numbers
+        `sample_size` random numbers if items_count > sample_size
+        otherwise items numbers
     """
-    if items_count <= 4:
+    if items_count <= sample_size:
         return list(range(items_count))
-    return random.sample(range(items_count), 4)
+    return random.sample(range(items_count), sample_size)
 
 
 def fast_validate(
-    schema: RawSchema, raw_items: RawItems, keys: pd.Index
+    schema: RawSchema,
+    raw_items: RawItems,
+    keys: pd.Index,
+    workers: int = 1,
+    memo_size: int = 0,
 ) -> Dict[str, set]:
     """Verify items one by one. It stops after the first error in an item in most cases.
     Faster than jsonschema validation
@@ -102,44 +159,620 @@ def fast_validate(
         schema: a JSON schema
         raw_items: a raw data to validate one by one
         keys: keys corresponding to raw_items index
+        workers: the number of processes to validate shards of items in
+        memo_size: the number of items to remember errors of, so identical items
+        are not validated again. Useful for jobs with many repeated items
 
     Returns:
         A dictionary of errors with message and item keys
     """
-    errors: DefaultDict = defaultdict(set)
-
-    validate = fastjsonschema.compile(schema)
-    for i, raw_item in enumerate(tqdm(raw_items, desc="Fast Schema Validation")):
-        raw_item.pop("_type", None)
-        raw_item.pop("_key", None)
-        try:
-            validate(raw_item)
-        except fastjsonschema.JsonSchemaException as error:
-            errors[str(error)].add(keys[i])
-    return dict(errors)
+    return validate_items(
+        schema,
+        raw_items,
+        keys,
+        "fast",
+        workers,
+        desc="Fast Schema Validation",
+        memo_size=memo_size,
+    )
 
 
 def full_validate(
-    schema: RawSchema, raw_items: RawItems, keys: pd.Index
+    schema: RawSchema,
+    raw_items: RawItems,
+    keys: pd.Index,
+    workers: int = 1,
+    memo_size: int = 0,
 ) -> Dict[str, set]:
     """This function uses jsonschema validator which returns all found error per item.
     See `fast_validate()` for arguments descriptions.
     """
-    errors: DefaultDict = defaultdict(set)
+    return validate_items(
+        schema,
+        raw_items,
+        keys,
+        "full",
+        workers,
+        desc="JSON Schema Validation",
+        memo_size=memo_size,
+    )
+
+
+def hybrid_validate(
+    schema: RawSchema,
+    raw_items: RawItems,
+    keys: pd.Index,
+    workers: int = 1,
+    memo_size: int = 0,
+) -> Dict[str, set]:
+    """Verify items with fastjsonschema and find all errors with jsonschema only in
+    items which failed. Returns the same errors as `full_validate()` as long as
+    both validators agree on valid items, at about `fast_validate()` speed.
+    See `fast_validate()` for arguments descriptions.
+    """
+    return validate_items(
+        schema,
+        raw_items,
+        keys,
+        "hybrid",
+        workers,
+        desc="Hybrid Schema Validation",
+        memo_size=memo_size,
+    )
+
+
+ItemErrors = Callable[[Dict[str, Any]], List[str]]
+
+
+def compile_validator(schema: RawSchema, method: str) -> ItemErrors:
+    """Create a function returning error messages of an item.
+
+    Args:
+        method: 'fast' to use fastjsonschema, which reports the first error only,
+        'full' to use jsonschema or 'hybrid' to use jsonschema on items failed by
+        fastjsonschema
+    """
+    if method not in ("fast", "full", "hybrid"):
+        raise ValueError(f"'{method}' is not a validation method")
+    view = needs_item_view(schema)
+    schema = ignore_meta(schema)
+    if method in ("fast", "hybrid"):
+        validate = compile_fast_validator(schema)
+
+        def fast_errors(raw_item: Dict[str, Any]) -> List[str]:
+            try:
+                validate(without_meta(raw_item) if view else raw_item)
+            except fastjsonschema.JsonSchemaException as error:
+                return [str(error)]
+            return []
+
+        if method == "fast":
+            return fast_errors
 
     validator = validators.validator_for(schema)(schema)
     validator.format_checker = FormatChecker()
-    for i, raw_item in enumerate(tqdm(raw_items, desc="JSON Schema Validation")):
-        raw_item.pop("_type", None)
-        raw_item.pop("_key", None)
-        for e in validator.iter_errors(raw_item):
-            error = format_validation_message(
-                e.message, e.path, e.schema_path, e.validator
-            )
-            errors[error].add(keys[i])
+
+    def full_errors(raw_item: Dict[str, Any]) -> List[str]:
+        if view:
+            raw_item = without_meta(raw_item)
+        errors = list(validator.iter_errors(raw_item))
+        if any(not e.path for e in errors) and not view:
+            # messages about the whole item quote it, so they shouldn't show meta
+            errors = list(validator.iter_errors(without_meta(raw_item)))
+        return [
+            format_validation_message(e.message, e.path, e.schema_path, e.validator)
+            for e in errors
+        ]
+
+    if method == "full":
+        return full_errors
+
+    def hybrid_errors(raw_item: Dict[str, Any]) -> List[str]:
+        return full_errors(raw_item) if fast_errors(raw_item) else []
+
+    return hybrid_errors
+
+
+def ignore_meta(schema: RawSchema) -> RawSchema:
+    """Allow meta fields like `_key` with any value at the top level of `schema` and
+    don't require them, so items are validated as they are instead of dropping
+    meta fields from them.
+
+    Returns:
+        A new schema, `schema` itself is not changed
+    """
+    properties = schema.get("properties")
+    if not isinstance(properties, dict):
+        properties = {}
+    ignoring: Dict[str, Any] = {
+        **schema,
+        "properties": {**properties, **{f: {} for f in META_FIELDS}},
+    }
+    required = schema.get("required")
+    if isinstance(required, list):
+        ignoring["required"] = [f for f in required if f not in META_FIELDS]
+    return ignoring
+
+
+def needs_item_view(schema: RawSchema) -> bool:
+    """Check if `schema` has top level keywords which see meta fields even if
+    `ignore_meta()` allows them, e.g. `minProperties` counts them. Items are
+    validated as copies without meta fields then, see `without_meta()`."""
+    return not set(schema) <= ANNOTATIONS | META_BLIND_KEYWORDS
+
+
+def without_meta(raw_item: Dict[str, Any]) -> Dict[str, Any]:
+    """Get a shallow copy of an item without `META_FIELDS`"""
+    return {k: v for k, v in raw_item.items() if k not in META_FIELDS}
+
+
+def schema_hash(schema: RawSchema) -> str:
+    """Hash the canonical json of `schema`, so equal schemas have the same hash
+    regardless of keys order"""
+    canonical = json.dumps(schema, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(canonical.encode()).hexdigest()
+
+
+# compiled fastjsonschema validators by schema hash, see `compile_fast_validator()`
+_fast_validators: Dict[str, Callable] = {}
+
+
+def compile_fast_validator(schema: RawSchema) -> Callable:
+    """Compile a fastjsonschema validator once per schema. The generated code is kept
+    in `validators` directory of the cache path, see `arche.tools.cache.get_path()`,
+    so other processes and sessions load it instead of compiling again."""
+    key = f"{schema_hash(schema)}-{fastjsonschema.VERSION}"
+    if key in _fast_validators:
+        return _fast_validators[key]
+
+    path = cache.get_path() / "validators" / f"{key}.py"
+    validate = None
+    if path.exists():
+        try:
+            validate = exec_validator(path.read_text())
+        except (OSError, SyntaxError, KeyError):
+            # a broken or unreadable file is replaced with a new one
+            logger.warning(f"Recompiling a broken validator {path}")
+            with contextlib.suppress(OSError):
+                path.unlink()
+    if validate is None:
+        code = fastjsonschema.compile_to_code(schema)
+        validate = exec_validator(code)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # a unique file, so concurrent writers don't rename each other's files
+            with tempfile.NamedTemporaryFile(
+                "w", dir=path.parent, suffix=".tmp", delete=False
+            ) as f:
+                f.write(code)
+            os.replace(f.name, path)
+        except OSError:
+            # the code is still usable from memory
+            pass
+    _fast_validators[key] = validate
+    return validate
+
+
+def exec_validator(code: str) -> Callable:
+    namespace: Dict[str, Any] = {}
+    exec(code, namespace)
+    return namespace["validate"]
+
+
+def stream_validate(
+    schema: RawSchema, raw_items: RawItems, method: str, memo_size: int = 0
+) -> Tuple[Dict[str, set], int]:
+    """Validate items as they come, keeping only keys of invalid items,
+    so memory doesn't depend on the number of items.
+
+    Args:
+        raw_items: items with `_key`, e.g. read from API
+        method: see `compile_validator()`
+        memo_size: see `validate_items()`
+
+    Returns:
+        A dictionary of errors with message and item `_key`, and the number of items
+    """
+    item_errors = compile_validator(schema, method)
+    if memo_size:
+        item_errors = ErrorsMemo(item_errors, memo_size)
+    errors: DefaultDict = defaultdict(set)
+    items_count = 0
+    for raw_item in raw_items:
+        key = raw_item.get("_key")
+        for error in item_errors(raw_item):
+            errors[error].add(key)
+        items_count += 1
+    return dict(errors), items_count
+
+
+@dataclass
+class ValidationState:
+    """Progress of incremental validation of a job, which can be saved to resume
+    validation from `next_index`, see `Arche.validate_incrementally()`.
+
+    Args:
+        source: a job key
+        schema_hash: see `schema_hash()`
+        method: see `compile_validator()`
+        next_index: the index of the first item which is not validated yet
+        errors: a dictionary of errors with message and item keys
+    """
+
+    source: str
+    schema_hash: str
+    method: str
+    next_index: int = 0
+    errors: Dict[str, set] = field(default_factory=dict)
+
+    def save(self, path: str) -> None:
+        state = {
+            **asdict(self),
+            "errors": {m: sorted(k) for m, k in self.errors.items()},
+        }
+        tmp_path = Path(path).with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(state))
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: str) -> "ValidationState":
+        state = json.loads(Path(path).read_text())
+        state["errors"] = {m: set(k) for m, k in state["errors"].items()}
+        return cls(**state)
+
+
+class ErrorsMemo:
+    def __init__(self, item_errors: ItemErrors, maxsize: int):
+        """Memoize errors of items by their content, so identical items are
+        validated once.
+
+        Args:
+            item_errors: a function returning error messages of an item
+            maxsize: the maximum number of kept items, least recently used
+            ones are dropped
+        """
+        self.item_errors = item_errors
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._errors: OrderedDict = OrderedDict()
+
+    def __call__(self, raw_item: Dict[str, Any]) -> List[str]:
+        content = json.dumps(without_meta(raw_item), sort_keys=True, default=str)
+        key = hashlib.sha1(content.encode()).digest()
+        errors = self._errors.get(key)
+        if errors is not None:
+            self._errors.move_to_end(key)
+            self.hits += 1
+            return errors
+        self.misses += 1
+        errors = self.item_errors(raw_item)
+        self._errors[key] = errors
+        if len(self._errors) > self.maxsize:
+            self._errors.popitem(last=False)
+        return errors
+
+
+def validate_items(
+    schema: RawSchema,
+    raw_items: RawItems,
+    keys: pd.Index,
+    method: str,
+    workers: int = 1,
+    desc: Optional[str] = None,
+    memo_size: int = 0,
+) -> Dict[str, set]:
+    """Validate items with `method`, see `compile_validator()`. Items are validated
+    in the current process or, if `workers` > 1, in shards across a pool of
+    processes. Each process compiles the validator once.
+
+    Args:
+        memo_size: if set, reuse errors of up to `memo_size` identical items,
+        see `ErrorsMemo`. The hit rate is shown in the progress bar
+
+    Returns:
+        A dictionary of errors with message and item keys
+    """
+    errors: DefaultDict = defaultdict(set)
+    if workers <= 1:
+        item_errors = compile_validator(schema, method)
+        if memo_size:
+            item_errors = ErrorsMemo(item_errors, memo_size)
+        with tqdm(raw_items, desc=desc) as p_bar:
+            for i, raw_item in enumerate(p_bar):
+                for error in item_errors(raw_item):
+                    errors[error].add(keys[i])
+            if memo_size:
+                report_hit_rate(p_bar, item_errors.hits, len(keys))  # type: ignore
+        return dict(errors)
+
+    if method != "full":
+        # compile once, forked processes inherit the validator
+        compile_validator(schema, method)
+    shard_size = max(min(math.ceil(len(keys) / (workers * 4)), 10_000), 1)
+    items_iter = iter(raw_items)
+    shards = (
+        (offset, list(itertools.islice(items_iter, shard_size)))
+        for offset in range(0, len(keys), shard_size)
+    )
+    hits = 0
+    with multiprocessing.Pool(
+        workers,
+        initializer=_init_shard_validator,
+        initargs=(schema, method, memo_size),
+    ) as pool, tqdm(desc=desc, total=len(keys)) as p_bar:
+        for shard_errors, shard_len, shard_hits in pool.imap(_validate_shard, shards):
+            for error, positions in shard_errors.items():
+                errors[error].update(keys[i] for i in positions)
+            hits += shard_hits
+            p_bar.update(shard_len)
+        if memo_size:
+            report_hit_rate(p_bar, hits, len(keys))
     return dict(errors)
 
 
+def report_hit_rate(p_bar: tqdm, hits: int, total: int) -> None:
+    hit_rate = f"{hits / total if total else 0:.0%} items were validated before"
+    p_bar.set_postfix_str(hit_rate)
+    logger.info(hit_rate)
+
+
+# a validator of the current pool process, see `validate_items()`
+_shard_item_errors: Optional[ItemErrors] = None
+
+
+def _init_shard_validator(schema: RawSchema, method: str, memo_size: int) -> None:
+    global _shard_item_errors
+    _shard_item_errors = compile_validator(schema, method)
+    if memo_size:
+        _shard_item_errors = ErrorsMemo(_shard_item_errors, memo_size)
+
+
+def _validate_shard(
+    shard: Tuple[int, List[Dict[str, Any]]]
+) -> Tuple[Dict[str, List[int]], int, int]:
+    """Returns errors with items positions, the shard size and memo hits"""
+    offset, raw_items = shard
+    hits = getattr(_shard_item_errors, "hits", 0)
+    errors: DefaultDict = defaultdict(list)
+    for i, raw_item in enumerate(raw_items, start=offset):
+        for error in _shard_item_errors(raw_item):  # type: ignore
+            errors[error].append(i)
+    return dict(errors), len(raw_items), getattr(_shard_item_errors, "hits", 0) - hits
+
+
+# keywords of top level properties which `columnar_validate()` checks by columns,
+# as well as `required`
+COLUMNAR_KEYWORDS = {
+    "type",
+    "enum",
+    "pattern",
+    "minimum",
+    "maximum",
+    "minLength",
+    "maxLength",
+}
+# keywords which don't affect validation
+ANNOTATIONS = EXTENDED_KEYWORDS | {
+    "$schema",
+    "$id",
+    "$comment",
+    "title",
+    "description",
+    "default",
+    "examples",
+    "definitions",
+}
+
+# a value of a field which an item doesn't have
+_MISSING = object()
+
+
+def columnar_validate(
+    schema: RawSchema,
+    raw_items: RawItems,
+    keys: pd.Index,
+    workers: int = 1,
+    memo_size: int = 0,
+    hybrid: bool = False,
+) -> Dict[str, set]:
+    """Check `required` and top level properties which use only `COLUMNAR_KEYWORDS`
+    column by column with pandas, and the rest of the schema item by item with
+    `full_validate()`.
+    The errors are the same as of `full_validate()`.
+
+    Columns are taken from raw items rather than a dataframe, which doesn't tell
+    missing, null and empty values apart.
+
+    Args:
+        hybrid: validate the rest of the schema with `hybrid_validate()`
+        See `fast_validate()` for other arguments descriptions.
+
+    Returns:
+        A dictionary of errors with message and item keys
+    """
+    if not isinstance(raw_items, (list, np.ndarray)):
+        raw_items = list(raw_items)
+    keys = np.asarray(keys)
+    columns, required, residual = split_schema(schema)
+    validator_class = validators.validator_for(schema)
+
+    errors: DefaultDict = defaultdict(set)
+    for name in tqdm(
+        list(dict.fromkeys([*columns, *required])), desc="Columnar Schema Validation"
+    ):
+        values = pd.Series(
+            [item.get(name, _MISSING) for item in raw_items], dtype=object
+        )
+        if name in required:
+            missing = np.fromiter((v is _MISSING for v in values), bool, len(values))
+            if missing.any():
+                error = next(validator_class({"required": [name]}).iter_errors({}))
+                errors[error.message].update(keys[missing].tolist())
+        if name in columns:
+            validator = validator_class(columns[name])
+            for message, invalid in column_errors(name, values, validator):
+                errors[message].update(keys[invalid].tolist())
+
+    if residual:
+        validate_func = hybrid_validate if hybrid else full_validate
+        for message, error_keys in validate_func(
+            residual, raw_items, keys, workers, memo_size
+        ).items():
+            errors[message].update(error_keys)
+    return dict(errors)
+
+
+def split_schema(
+    schema: RawSchema,
+) -> Tuple[Dict[str, Any], List[str], Optional[RawSchema]]:
+    """Split schema into top level properties and required fields which can be
+    checked by columns, and the rest of the schema, which is None if it doesn't
+    validate anything. Meta fields like `_key` are left to the rest of the schema,
+    which allows them, see `ignore_meta()`."""
+
+    def columnar(field: str) -> bool:
+        return bool(field) and not field.startswith("_")
+
+    properties: Dict[str, Any] = schema.get("properties") or {}
+    columns = {
+        field: field_schema
+        for field, field_schema in properties.items()
+        if columnar(field)
+        and isinstance(field_schema, dict)
+        and set(field_schema) - ANNOTATIONS <= COLUMNAR_KEYWORDS
+    }
+    schema_required: Any = schema.get("required")
+    required: List[str] = (
+        list(schema_required) if isinstance(schema_required, list) else []
+    )
+    residual: Dict[str, Any] = {k: v for k, v in schema.items() if k != "properties"}
+    residual_required = [f for f in required if not columnar(f)]
+    if residual_required:
+        residual["required"] = residual_required
+    else:
+        residual.pop("required", None)
+    if "additionalProperties" in schema:
+        # checked properties are still allowed
+        residual["properties"] = {
+            f: {} if f in columns else s for f, s in properties.items()
+        }
+    elif len(columns) < len(properties):
+        residual["properties"] = {
+            f: s for f, s in properties.items() if f not in columns
+        }
+
+    required = [f for f in required if columnar(f)]
+    checks = set(residual) - ANNOTATIONS
+    if not checks or (
+        checks == {"type"} and residual["type"] in ("object", ["object"])
+    ):
+        return columns, required, None
+    return columns, required, residual
+
+
+def column_errors(
+    field: str, values: pd.Series, validator: Any
+) -> Iterator[Tuple[str, np.ndarray]]:
+    """Check values of a field against a schema of supported keywords
+    the way `validator` does it for each value.
+
+    Yields:
+        Formatted error messages and masks of invalid values
+    """
+    field_schema = validator.schema
+    present = np.fromiter((v is not _MISSING for v in values), bool, len(values))
+    kinds = values.map(type)
+    strings = (kinds == str).values
+    numbers = kinds.isin([int, float]).values
+
+    checks: Dict[str, np.ndarray] = {}
+    if "type" in field_schema:
+        checks["type"] = present & ~is_of_type(
+            values, kinds, field_schema["type"], validator
+        )
+    if "enum" in field_schema:
+        enum_validator = type(validator)({"enum": field_schema["enum"]})
+        checks["enum"] = present & ~map_distinct(values, enum_validator.is_valid)
+    if "pattern" in field_schema:
+        invalid = np.zeros(len(values), bool)
+        invalid[strings] = (
+            ~values[strings]
+            .str.contains(field_schema["pattern"], regex=True)
+            .values.astype(bool)
+        )
+        checks["pattern"] = invalid
+    for keyword, compare in [
+        ("minLength", lambda lengths, limit: lengths < limit),
+        ("maxLength", lambda lengths, limit: lengths > limit),
+    ]:
+        if keyword in field_schema:
+            invalid = np.zeros(len(values), bool)
+            invalid[strings] = compare(
+                values[strings].str.len().values, field_schema[keyword]
+            )
+            checks[keyword] = invalid
+    for keyword, compare in [
+        ("minimum", lambda numbers, limit: numbers < limit),
+        ("maximum", lambda numbers, limit: numbers > limit),
+    ]:
+        if keyword in field_schema:
+            invalid = np.zeros(len(values), bool)
+            # python comparisons of objects keep big integers exact
+            invalid[numbers] = compare(values[numbers].values, field_schema[keyword])
+            checks[keyword] = invalid
+
+    for keyword, invalid in checks.items():
+        if not invalid.any():
+            continue
+        value = values[invalid].iloc[0]
+        # messages without values are equal for all values of a field
+        error = next(e for e in validator.iter_errors(value) if e.validator == keyword)
+        message = format_validation_message(
+            error.message,
+            deque([field]),
+            deque(["properties", field, keyword]),
+            keyword,
+        )
+        yield message, invalid
+
+
+def is_of_type(
+    values: pd.Series, kinds: pd.Series, types: Any, validator: Any
+) -> np.ndarray:
+    """Check if values are of any of schema `types` by their python types"""
+    types = types if isinstance(types, list) else [types]
+    valid = np.zeros(len(values), bool)
+    for kind in kinds.unique():
+        selected = (kinds == kind).values
+        sample = values[selected].iloc[0]
+        if kind is float and not any(
+            validator.is_type(sample, t) for t in types if t != "integer"
+        ):
+            # floats like 1.0 can be integers, depending on the draft
+            if "integer" in types and validator.is_type(1.0, "integer"):
+                floats = values[selected].values.astype(float)
+                valid[selected] = np.mod(floats, 1) == 0
+            continue
+        valid[selected] = any(validator.is_type(sample, t) for t in types)
+    return valid
+
+
+def map_distinct(values: pd.Series, func: Callable[[Any], bool]) -> np.ndarray:
+    """Call `func` once per distinct hashable value of the same type"""
+    results: Dict[Tuple[type, Any], bool] = {}
+    mapped = np.empty(len(values), bool)
+    for i, value in enumerate(values):
+        try:
+            key = (type(value), value)
+            if key not in results:
+                results[key] = func(value)
+            mapped[i] = results[key]
+        except TypeError:
+            mapped[i] = func(value)
+    return mapped
+
+
 def format_validation_message(
     error_msg: str, path: Deque, schema_path: Deque, validator: str
 ) -> str:
@@ -6,7 +6,7 @@ from typing import Any, Dict, List, Optional, Tuple
 
 
 from arche.readers.items import CollectionItems, JobItems
-from arche.rules.result import Level, Result, Stat
+from arche.rules.result import keys_equal, Level, Result, Stat
 import numpy as np
 import pandas as pd
 import pytest
@@ -28,6 +28,12 @@ DEFAULT_SCHEMA = {
 }
 
 
+@pytest.fixture(autouse=True)
+def cache_dir(monkeypatch, tmp_path):
+    """Keep anything cached by default out of the home directory"""
+    monkeypatch.setenv("ARCHE_CACHE_DIR", str(tmp_path / "cache"))
+
+
 @pytest.fixture(scope="session")
 def get_cloud_items(request):
     return CLOUD_ITEMS
@@ -234,11 +240,11 @@ def assert_results_equal(left: Result, right: Result, **kwargs):
         "messages",
         "items_count",
         "_err_items_count",
-        "_err_keys",
         "_figures",
     ]
     for attr in attrs:
         assert getattr(left, attr) == getattr(right, attr)
+    assert keys_equal(left._err_keys, right._err_keys)
     assert len(left.stats) == len(right.stats)
 
     def assert_dicts_equal(left: Dict, right: Dict):
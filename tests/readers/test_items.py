@@ -1,7 +1,9 @@
 from arche import SH_URL
-from arche.readers.items import Items, CollectionItems, JobItems
+from arche.readers.items import Items, CollectionItems, JobItems, StreamingJobItems
+from arche.rules.json_schema import validate
 from conftest import Collection, Job
 import numpy as np
+from packaging.version import Version
 import pandas as pd
 import pytest
 
@@ -46,7 +48,7 @@ collection_items = np.array(
 )
 expected_col_df = pd.DataFrame(
     {"name": ["Book", "Movie", "Guitar", "Dog"]},
-    index=[f"{SH_URL}/key/{i}" for i in [10, 1, 2, 3]],
+    index=["10", "1", "2", "3"],
 )
 
 
@@ -73,8 +75,15 @@ def test_collection_items(mocker, count, start, filters, expected_count):
     assert len(items) == expected_count
     assert items.limit == len(collection_items)
     assert items.count == expected_count
+    assert items.keys_url == f"{SH_URL}/key/"
     get_items_mock.assert_called_once_with(
-        "key", expected_count, 0, start, filters, desc="Fetching from 'key'"
+        "key",
+        expected_count,
+        0,
+        start,
+        filters,
+        desc="Fetching from 'key'",
+        fields=None,
     )
 
 
@@ -88,7 +97,7 @@ job_items = np.array(
 )
 expected_job_df = pd.DataFrame(
     {"name": ["Elizabeth", "Margaret", "Yulia", "Vivien"]},
-    index=[f"{SH_URL}/112358/13/21/item/{i}" for i in range(4)],
+    index=range(4),
 )
 
 
@@ -102,6 +111,131 @@ def test_job_items(mocker):
     pd.testing.assert_frame_equal(items.df, expected_job_df.iloc[1:3])
     assert items.count == 2
     assert items.start == "112358/13/21/1"
+    assert items.keys_url == f"{SH_URL}/112358/13/21/item/"
+    assert items.format_keys(items.df.index).tolist() == [
+        f"{SH_URL}/112358/13/21/item/{i}" for i in [1, 2]
+    ]
+
+
+def test_job_items_no_raw(mocker):
+    mocker.patch("arche.readers.items.JobItems.job", return_value=Job(), autospec=True)
+    mocker.patch("arche.tools.api.get_items", return_value=job_items, autospec=True)
+    items = JobItems(key="112358/13/21", count=4, keep_raw=False)
+    assert items._raw is None
+    assert list(items.raw) == [{"name": i["name"]} for i in job_items]
+    pd.testing.assert_frame_equal(items.df, expected_job_df)
+
+
+def test_iter_raw():
+    df = pd.DataFrame(
+        {"name": ["a", None, "c"], "price": [1.5, np.nan, 3], "sizes": [[1], [], None]}
+    )
+    items = Items(raw=None, df=df)
+    raw = list(items.iter_raw(chunk_size=2))
+    assert raw == [
+        {"name": "a", "price": 1.5, "sizes": [1]},
+        {},
+        {"name": "c", "price": 3.0},
+    ]
+    assert type(raw[0]["price"]) is float
+    assert [len(list(c.raw)) for c in items.iter_chunks(2)] == [2, 1]
+
+
+def test_iter_raw_integers():
+    items = Items(raw=None, df=pd.DataFrame({"id": [1, np.nan, 3]}))
+    raw = list(items.iter_raw())
+    assert raw == [{"id": 1}, {}, {"id": 3}]
+    assert type(raw[0]["id"]) is int
+
+
+@pytest.mark.parametrize("chunk_size, expected_lengths", [(4, [4]), (3, [3, 1])])
+def test_items_iter_chunks(chunk_size, expected_lengths):
+    items = Items.from_array(job_items)
+    chunks = list(items.iter_chunks(chunk_size))
+    assert [len(c) for c in chunks] == expected_lengths
+    np.testing.assert_array_equal(np.concatenate([c.raw for c in chunks]), job_items)
+    pd.testing.assert_frame_equal(pd.concat([c.df for c in chunks]), items.df)
+
+
+def test_streaming_job_items(mocker):
+    mocker.patch(
+        "arche.readers.items.StreamingJobItems.job", return_value=Job(), autospec=True
+    )
+    iter_items_mock = mocker.patch(
+        "arche.tools.api.iter_items",
+        return_value=iter([job_items[1:3], job_items[3:]]),
+        autospec=True,
+    )
+    items = StreamingJobItems(key="112358/13/21", count=3, start_index=1, chunk_size=2)
+    assert len(items) == 3
+    chunks = list(items)
+    assert [len(c) for c in chunks] == [2, 1]
+    pd.testing.assert_frame_equal(
+        pd.concat([c.df for c in chunks]), expected_job_df.iloc[1:]
+    )
+    iter_items_mock.assert_called_once_with(
+        "112358/13/21", 3, 1, "112358/13/21/1", None, chunk_size=2, fields=None
+    )
+
+
+def test_streaming_job_items_filtered_len():
+    items = StreamingJobItems(key="112358/13/21", count=4, filters=[("_type", ["A"])])
+    with pytest.raises(TypeError):
+        len(items)
+
+
+def test_streaming_job_items_raw(mocker):
+    mocker.patch(
+        "arche.readers.items.StreamingJobItems.job", return_value=Job(), autospec=True
+    )
+    mocker.patch(
+        "arche.tools.api.iter_items",
+        side_effect=lambda *args, **kwargs: iter([job_items[:2], job_items[2:]]),
+        autospec=True,
+    )
+    items = StreamingJobItems(key="112358/13/21", count=4, chunk_size=2)
+    assert list(items.raw) == list(job_items)
+    assert list(items.raw) == list(job_items)
+    assert not isinstance(items, Items)
+    with pytest.raises(AttributeError):
+        items.df
+
+
+@pytest.mark.parametrize(
+    "count, filters, expected_args, expected_kwargs",
+    [
+        (200_000, None, ("112358/13/21", 200_000, 1), {"fields": None}),
+        (
+            200_000,
+            [("_type", ["Book"])],
+            ("112358/13/21", 299_999, 1),
+            {"filters": [("_type", ["Book"])], "fields": None},
+        ),
+    ],
+)
+def test_job_items_with_pool(mocker, count, filters, expected_args, expected_kwargs):
+    mocker.patch("arche.readers.items.JobItems.job", return_value=Job(), autospec=True)
+    mocker.patch("arche.tools.api.get_items_count", return_value=300_000, autospec=True)
+    pool_mock = mocker.patch(
+        "arche.tools.api.get_items_with_pool", return_value=job_items, autospec=True
+    )
+    JobItems("112358/13/21", count, 1, filters)
+    pool_mock.assert_called_once_with(*expected_args, **expected_kwargs)
+
+
+def test_collection_items_with_pool(mocker):
+    mocker.patch(
+        "arche.tools.api.get_collection",
+        return_value=Collection(300_000),
+        autospec=True,
+    )
+    pool_mock = mocker.patch(
+        "arche.tools.api.get_collection_items_with_pool",
+        return_value=collection_items,
+        autospec=True,
+    )
+    CollectionItems("key")
+    pool_mock.assert_called_once_with("key", 300_000, None, None, fields=None)
 
 
 def test_process_df():
@@ -112,6 +246,31 @@ def test_process_df():
     pd.testing.assert_frame_equal(df, exp_df)
 
 
+def test_clean_empty():
+    df = pd.DataFrame(
+        {
+            "a": [None, 1, 2],
+            "b": ["", "x", None],
+            "c": [[], [1], {}],
+            "d": [0, 1, 2],
+            "e": [True, False, True],
+            "f": [False, "", 0.0],
+        }
+    )
+    Items.clean_empty(df)
+    exp_df = pd.DataFrame(
+        {
+            "a": [np.nan, 1, 2],
+            "b": [np.nan, "x", np.nan],
+            "c": [np.nan, [1], np.nan],
+            "d": [0, 1, 2],
+            "e": [True, False, True],
+            "f": [False, np.nan, 0.0],
+        }
+    )
+    pd.testing.assert_frame_equal(df, exp_df)
+
+
 @pytest.mark.parametrize(
     "data, expected_cats",
     [
@@ -134,7 +293,81 @@ def test_categorize(data, expected_cats):
     )
 
 
+def test_categorize_nested():
+    df = pd.DataFrame(
+        {
+            "a": [[i % 2] for i in range(100)],
+            "b": [{"k": i} for i in range(100)],
+            "c": [np.nan] * 50 + [{"k": [0]}] * 50,
+        }
+    )
+    pd_df = df.copy()
+    Items.categorize(df)
+    pd.testing.assert_frame_equal(df, pd_df)
+    df["a"].iloc[0].append(1)
+    assert df["a"].iloc[2] == [0]
+
+
+@pytest.mark.parametrize(
+    "values, expected",
+    [
+        (pd.Series(range(100)), False),
+        (pd.Series([0, 1] * 50 + [np.nan, None]), True),
+        (pd.Series(list(range(10)) * 10 + [np.nan]), False),
+        (pd.Series([[0], [1]] * 50), False),
+        (pd.Series([0] * 10 + [[1]]), False),
+    ],
+)
+def test_has_few_uniques(values, expected):
+    assert Items.has_few_uniques(values, 10, chunk_size=3) is expected
+
+
 def test_no_categorize():
     df = pd.DataFrame({"a": [i for i in range(99)]})
     Items.categorize(df)
     assert df.select_dtypes(["category"]).empty
+
+
+def test_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    raw = [
+        {"name": "a", "price": 1, "tags": ["x"], "meta": {"k": [1]}, "mixed": 1},
+        {"name": "b", "tags": ["y", "z"], "mixed": "1"},
+    ]
+    items = Items.from_array(raw)
+    items.keys_url = f"{SH_URL}/112358/13/21/item/"
+    path = str(tmp_path / "items.parquet")
+    items.to_parquet(path)
+
+    loaded = Items.from_parquet(path)
+    pd.testing.assert_frame_equal(loaded.df, items.df)
+    assert list(loaded.raw) == raw
+    assert loaded.keys_url == items.keys_url
+
+
+@pytest.mark.skipif(
+    Version(pd.__version__) < Version("1.3"),
+    reason="string[pyarrow] requires pandas>=1.3",
+)
+def test_use_arrow_strings():
+    pytest.importorskip("pyarrow")
+    items = Items.from_df(pd.DataFrame({"name": ["a", None], "price": [1, 2]}))
+    items.use_arrow_strings()
+    assert items.df["name"].dtype == "string[pyarrow]"
+    assert items.df["price"].dtype == np.int64
+
+
+@pytest.mark.skipif(
+    Version(pd.__version__) < Version("1.3"),
+    reason="string[pyarrow] requires pandas>=1.3",
+)
+def test_parquet_arrow_strings_validation(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / "items.parquet")
+    Items.from_array([{"name": "a"}, {"name": None}]).to_parquet(path)
+    items = Items.from_parquet(path, arrow_strings=True)
+    assert list(items.raw) == [{"name": "a"}, {}]
+    result = validate(
+        {"properties": {"name": {"type": "string"}}}, items.raw, items.df.index
+    )
+    assert not result.errors
@@ -152,6 +152,29 @@ def test_schema_tags(schema, expected_tags):
     assert Schema(schema).tags == expected_tags
 
 
+@pytest.mark.parametrize(
+    "tags, expected_fields",
+    [
+        (["unique", "name_field"], ["id", "url", "name"]),
+        (["category"], ["type", "size"]),
+        (["product_price_field"], []),
+    ],
+)
+def test_get_fields(tags, expected_fields):
+    schema = Schema(
+        {
+            "properties": {
+                "id": {"tag": "unique"},
+                "url": {"tag": ["unique", "name_field"]},
+                "name": {"tag": "name_field"},
+                "type": {"tag": "category", "enum": ["a"]},
+                "size": {"enum": ["S", "M"]},
+            }
+        }
+    )
+    assert schema.get_fields(tags) == expected_fields
+
+
 @pytest.mark.parametrize(
     "tags, exception",
     [
@@ -99,3 +99,81 @@ def test_find_by_tags(data, tagged_fields, expected_messages):
         duplicates.find_by_tags(df, tagged_fields),
         create_result("Duplicates", expected_messages, items_count=len(df)),
     )
+
+
+def test_find_by_mixed_types():
+    df = pd.DataFrame({"id": [1, "1", 2.0, 2, True, "True"]})
+    assert_results_equal(
+        duplicates.find_by(df, ["id"]),
+        create_result(
+            "Duplicates",
+            {
+                Level.ERROR: [
+                    (
+                        "id contains 2 duplicated value(s)",
+                        None,
+                        {"same '1' `id`": [0, 4], "same '2.0' `id`": [2, 3]},
+                    )
+                ]
+            },
+            items_count=len(df),
+        ),
+    )
+
+
+def test_find_by_unhashable():
+    df = pd.DataFrame({"tags": [["a"], ["b"], ["a"]], "id": [{"k": 1}, None, {"k": 1}]})
+    assert_results_equal(
+        duplicates.find_by(df, [["tags", "id"]]),
+        create_result(
+            "Duplicates",
+            {
+                Level.ERROR: [
+                    (
+                        "tags, id contains 1 duplicated value(s)",
+                        None,
+                        {"same '['a']' `tags`, '{'k': 1}' `id`": [0, 2]},
+                    )
+                ]
+            },
+            items_count=len(df),
+        ),
+    )
+
+
+def test_find_by_max_described(mocker):
+    mocker.patch("arche.rules.duplicates.MAX_DESCRIBED", 1)
+    df = pd.DataFrame({"id": ["1", "0", "1", "0", "2", "2"]})
+    assert_results_equal(
+        duplicates.find_by(df, ["id"]),
+        create_result(
+            "Duplicates",
+            {
+                Level.ERROR: [
+                    (
+                        "id contains 3 duplicated value(s)",
+                        None,
+                        {
+                            "same '1' `id`": [0, 2],
+                            "same id in 2 more values": [1, 3, 4, 5],
+                        },
+                    )
+                ]
+            },
+            items_count=len(df),
+        ),
+    )
+
+
+@pytest.mark.parametrize(
+    "hashes, expected_positions, expected_sizes",
+    [
+        ([], [], []),
+        ([1, 2, 3], [], []),
+        ([7, 5, 7, 5, 1, 7], [0, 2, 5, 1, 3], [3, 2]),
+    ],
+)
+def test_find_groups(hashes, expected_positions, expected_sizes):
+    positions, sizes = duplicates.find_groups(np.array(hashes, dtype=np.uint64))
+    np.testing.assert_array_equal(positions, expected_positions)
+    np.testing.assert_array_equal(sizes, expected_sizes)
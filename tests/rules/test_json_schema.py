@@ -1,6 +1,14 @@
-from arche.rules.json_schema import check_tags, validate
+from arche.readers.items import JobItems
+from arche.rules.json_schema import (
+    check_tags,
+    validate,
+    validate_incrementally,
+    validate_stream,
+)
 from arche.rules.result import Level
+from arche.tools.schema import ValidationState
 from conftest import *
+import numpy as np
 import pytest
 
 
@@ -160,3 +168,65 @@ def test_validate_passed(get_schema, get_raw_items):
         validate(get_schema, get_raw_items, range(len(get_raw_items))),
         create_result("JSON Schema Validation", {}),
     )
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_validate_no_raw(mocker, fast):
+    mocker.patch("arche.readers.items.JobItems.job", return_value=Job(), autospec=True)
+    mocker.patch(
+        "arche.tools.api.get_items",
+        return_value=np.array(
+            [{"_key": f"112358/13/21/{i}", "price": p} for i, p in enumerate([1, 2])]
+            + [{"_key": "112358/13/21/2"}]
+        ),
+        autospec=True,
+    )
+    items = JobItems(key="112358/13/21", count=3, keep_raw=False)
+    schema = {
+        "$schema": "http://json-schema.org/draft-04/schema",
+        "properties": {"price": {"type": "integer"}},
+    }
+    assert_results_equal(
+        validate(schema, items.raw, items.df.index, fast=fast),
+        create_result("JSON Schema Validation", {}),
+    )
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_validate_stream(fast):
+    raw_items = (
+        {"_key": f"112358/13/21/{i}", "_type": "Book", "price": p}
+        for i, p in enumerate([0, "1", 2, None])
+    )
+    message = "data.price must be number" if fast else "price is not of type 'number'"
+    assert_results_equal(
+        validate_stream(
+            {"properties": {"price": {"type": "number"}}},
+            raw_items,
+            lambda keys: pd.Index(keys.str.rsplit("/").str[-1].astype(int)),
+            fast=fast,
+        ),
+        create_result(
+            "JSON Schema Validation",
+            {Level.ERROR: [("2 (50%) items have 1 errors", None, {message: {1, 3}})]},
+        ),
+    )
+
+
+def test_validate_incrementally():
+    state = ValidationState("112358/13/21", "hash", "full", 2, {"error": {0}})
+    result = validate_incrementally(
+        {"properties": {"price": {"type": "number"}}},
+        iter([{"_key": "2", "price": "1"}, {"_key": "3", "price": 1}]),
+        state,
+        lambda keys: pd.Index(keys.astype(int)),
+    )
+    assert state.next_index == 4
+    assert state.errors == {"error": {0}, "price is not of type 'number'": {2}}
+    assert_results_equal(
+        result,
+        create_result(
+            "JSON Schema Validation",
+            {Level.ERROR: [("2 (50%) items have 2 errors", None, state.errors)]},
+        ),
+    )
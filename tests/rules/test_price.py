@@ -1,3 +1,4 @@
+from arche import SH_URL
 import arche.rules.price as p
 from arche.rules.result import Level
 from conftest import *
@@ -77,7 +78,30 @@ compare_prices_inputs = [
                 )
             ]
         },
-    )
+    ),
+    (
+        {
+            "price": [10, "a", 1, 20, 5],
+            "url": ["http://1", "http://2", "http://1", "nan", "http://3"],
+        },
+        {"price": [12, 1, 30, "7"], "url": ["http://1", "http://2", "nan", "http://3"]},
+        {"product_price_field": ["price"], "product_url_field": ["url"]},
+        {
+            Level.ERROR: [
+                (
+                    "5 checked, 3 errors",
+                    (
+                        "different prices for url: http://1\nsource price is 10 for 0\n"
+                        "target price is 12 for 0\n"
+                        "different prices for url: http://1\nsource price is 10 for 0\n"
+                        "target price is 12 for 0\n"
+                        "different prices for url: http://3\nsource price is 5 for 4\n"
+                        "target price is 7 for 3"
+                    ),
+                )
+            ]
+        },
+    ),
 ]
 
 
@@ -95,6 +119,20 @@ def test_compare_prices_for_same_urls(
     )
 
 
+def test_compare_prices_for_same_urls_keys_url():
+    result = p.compare_prices_for_same_urls(
+        pd.DataFrame({"url": ["http://1"], "price": [10]}),
+        pd.DataFrame({"url": ["http://1"], "price": [12]}),
+        {"product_url_field": ["url"], "product_price_field": ["price"]},
+        source_keys_url=f"{SH_URL}/1/2/3/item/",
+        target_keys_url=f"{SH_URL}/1/2/4/item/",
+    )
+    assert result.messages[Level.ERROR][0].detailed == (
+        f"different prices for url: http://1\nsource price is 10 for "
+        f"{SH_URL}/1/2/3/item/0\ntarget price is 12 for {SH_URL}/1/2/4/item/0"
+    )
+
+
 compare_names_inputs = [
     (
         {"name": ["John", "Carl"], "url": ["http://1", "http://2"]},
@@ -113,7 +151,43 @@ compare_names_inputs = [
                 )
             ]
         },
-    )
+    ),
+    (
+        {
+            "name": ["John", "Carl", "Ann", np.nan, "Bob"],
+            "url": ["http://1", "http://2", "http://1", "http://3", "nan"],
+        },
+        {
+            "name": ["Johnny", "Carl", "Tom", "Kate"],
+            "url": ["http://1", "http://2", "http://3", "nan"],
+        },
+        {"name_field": ["name"], "product_url_field": ["url"]},
+        {
+            Level.ERROR: [
+                (
+                    "5 checked, 2 errors",
+                    (
+                        "different names for url: http://1\nsource name is John for 0\n"
+                        "target name is Johnny for 0\n"
+                        "different names for url: http://1\nsource name is John for 0\n"
+                        "target name is Johnny for 0"
+                    ),
+                )
+            ]
+        },
+    ),
+    (
+        {"name": ["John"], "url": ["http://1"]},
+        {"name": ["John"], "url": ["http://1"]},
+        {"name_field": ["name"], "product_url_field": ["url"]},
+        {Level.INFO: [("1 checked, 0 errors",)]},
+    ),
+    (
+        {"name": ["John", "Carl"], "url": ["http://1", None]},
+        {"name": ["John", "Ted"], "url": ["http://1", None]},
+        {"name_field": ["name"], "product_url_field": ["url"]},
+        {Level.INFO: [("1 checked, 0 errors",)]},
+    ),
 ]
 
 
@@ -161,3 +235,39 @@ def test_compare_prices_for_same_names(
     assert_results_equal(
         result, create_result("Compare Prices For Same Names", expected_messages)
     )
+
+
+@pytest.mark.parametrize(
+    "normalize, expected_messages",
+    [
+        (False, {Level.INFO: [("0 checked, 0 errors",)]}),
+        (
+            True,
+            {
+                Level.ERROR: [
+                    (
+                        "3 checked, 1 errors",
+                        (
+                            "different price for black tea\nsource price is 5.0 for 1\n"
+                            "target price is 8.0 for 0"
+                        ),
+                    )
+                ]
+            },
+        ),
+    ],
+)
+def test_compare_prices_for_same_names_normalize(normalize, expected_messages):
+    result = p.compare_prices_for_same_names(
+        pd.DataFrame(
+            {"name": ["Coffee", "Black  Tea ", "juice"], "price": [3.0, 5.0, 2.0]}
+        ),
+        pd.DataFrame(
+            {"name": ["black tea", "coffee", "Juice"], "price": [8.0, 3.1, 2.0]}
+        ),
+        {"name_field": ["name"], "product_price_field": ["price"]},
+        normalize=normalize,
+    )
+    assert_results_equal(
+        result, create_result("Compare Prices For Same Names", expected_messages)
+    )
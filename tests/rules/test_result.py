@@ -1,5 +1,14 @@
-from arche.rules.result import Level, Message, Result, Outcome
+from arche.rules.result import (
+    compact_keys,
+    keys_equal,
+    Level,
+    Message,
+    Outcome,
+    Result,
+    union_keys,
+)
 from conftest import create_named_df, create_result, get_report_from_iframe
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -29,13 +38,13 @@ def test_message_not_eq(source, target):
 @pytest.mark.parametrize(
     "errors, true_err_keys",
     [
-        ({"a": {1, 2, 3}, "b": {2, 3, 4}}, {1, 2, 3, 4}),
+        ({"a": {1, 2, 3}, "b": {2, 3, 4}}, np.array([1, 2, 3, 4])),
         ({"a": {"2"}, "b": {"3"}}, {"2", "3"}),
         (None, set()),
     ],
 )
 def test_message_err_keys(errors, true_err_keys):
-    assert Message("x", errors=errors).err_keys == true_err_keys
+    assert keys_equal(Message("x", errors=errors).err_keys, true_err_keys)
 
 
 @pytest.mark.parametrize(
@@ -48,13 +57,44 @@ def test_message_err_keys(errors, true_err_keys):
                     Message("x", errors={"a": {3, 5}, "b": {3}}),
                 ]
             },
-            {1, 2, 3, 5},
+            np.array([1, 2, 3, 5]),
         ),
         (dict(), set()),
     ],
 )
 def test_result_err_keys(messages, true_err_keys):
-    assert Result("x", messages=messages).err_keys == true_err_keys
+    assert keys_equal(Result("x", messages=messages).err_keys, true_err_keys)
+
+
+@pytest.mark.parametrize(
+    "keys, expected",
+    [
+        ({3, 1, 2}, np.array([1, 2, 3], dtype=np.int32)),
+        ([5, 5, 2**40], np.array([5, 2**40], dtype=np.int64)),
+        (pd.Index([2, 0]), np.array([0, 2], dtype=np.int32)),
+        ({"1", "0"}, {"1", "0"}),
+        (["a/0", "a/0"], ["a/0", "a/0"]),
+    ],
+)
+def test_compact_keys(keys, expected):
+    keys = compact_keys(keys)
+    if isinstance(expected, np.ndarray):
+        assert keys.dtype == expected.dtype
+        np.testing.assert_array_equal(keys, expected)
+    else:
+        assert keys == expected
+
+
+def test_union_keys():
+    np.testing.assert_array_equal(
+        union_keys([np.array([1, 3]), np.array([0, 3])]), [0, 1, 3]
+    )
+    assert union_keys([np.array([1]), {"a"}]) == {1, "a"}
+
+
+def test_message_eq_compact():
+    assert Message("x", errors={"a": {2, 1}}) == Message("x", errors={"a": [1, 2]})
+    assert Message("x", errors={"a": {2, 1}}) != Message("x", errors={"a": [1]})
 
 
 @pytest.mark.parametrize(
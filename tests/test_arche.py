@@ -2,7 +2,9 @@ from typing import Dict, List
 
 from arche import arche, SH_URL
 from arche.arche import Arche
+import arche.rules.price as price_rules
 from arche.rules.result import *
+import arche.tools.schema as schema_tools
 from conftest import create_result, get_report_from_iframe
 import pandas as pd
 import pytest
@@ -112,6 +114,48 @@ def test_get_items_from_collection(mocker, get_raw_items, source, count, filters
     assert items.filters == filters
 
 
+def test_get_rules_fields():
+    schema = {
+        "properties": {
+            "name": {"tag": "name_field"},
+            "url": {"tag": "product_url_field"},
+            "price": {"tag": "product_price_field"},
+            "description": {},
+        }
+    }
+    a = Arche("112358/13/21", schema=schema)
+    assert a.get_rules_fields() == ["price", "name", "url"]
+    assert a.get_rules_fields([price_rules.compare_names_for_same_urls]) == [
+        "url",
+        "name",
+    ]
+
+
+def test_get_items_fields(mocker):
+    mocker.patch("arche.readers.items.JobItems.job", autospec=True)
+    get_items_mock = mocker.patch(
+        "arche.tools.api.get_items",
+        return_value=[{"_key": "112358/13/21/0", "name": "a"}],
+        autospec=True,
+    )
+    a = Arche("112358/13/21", count=1, fields=["name"])
+    assert a.source_items.fields == ["name"]
+    assert get_items_mock.call_args[1]["fields"] == ["name"]
+
+
+@pytest.mark.parametrize(
+    "method",
+    ["report_all", "run_all_rules", "validate_with_json_schema", "glance"],
+)
+def test_all_fields_methods_reject_fields(mocker, method):
+    get_items_mock = mocker.patch("arche.arche.Arche.get_items", autospec=True)
+    a = Arche("112358/13/21", schema={"properties": {"name": {}}}, fields=["name"])
+    with pytest.raises(ValueError) as excinfo:
+        getattr(a, method)()
+    assert str(excinfo.value).startswith(f"{method}() needs all fields of items")
+    get_items_mock.assert_not_called()
+
+
 def test_get_items_from_bad_source():
     with pytest.raises(ValueError) as excinfo:
         Arche.get_items(source="bad_key", count=1, start=1, filters=None)
@@ -231,6 +275,100 @@ def test_validate_with_json_schema(mocker, get_job_items, get_schema):
     assert a.report.results.get("JSON Schema Validation") == res
 
 
+@pytest.mark.parametrize(
+    "method, expected_kwargs",
+    [
+        ("glance", {"fast": True, "workers": 4, "memo_size": 0}),
+        (
+            "validate_with_json_schema",
+            {"workers": 4, "hybrid": False, "memo_size": 0, "columnar": False},
+        ),
+    ],
+)
+def test_validate_workers(mocker, get_job_items, get_schema, method, expected_kwargs):
+    mocker.patch("arche.report.Report.__call__", autospec=True)
+    mocker.patch("arche.rules.result.Result.show", autospec=True)
+    validate_mock = mocker.patch(
+        "arche.rules.json_schema.validate",
+        return_value=create_result("JSON Schema Validation", {}),
+        autospec=True,
+    )
+    a = Arche("source", schema=get_schema)
+    a._source_items = get_job_items
+    getattr(a, method)(workers=4)
+    assert validate_mock.call_args[1] == expected_kwargs
+
+
+def test_validate_stream(mocker, get_schema):
+    mocker.patch("arche.report.Report.__call__", autospec=True)
+    mocker.patch("arche.readers.items.StreamingJobItems.job", autospec=True)
+    mocker.patch(
+        "arche.tools.api.iter_items",
+        return_value=iter(
+            [[{"_key": "112358/13/21/0", "price": 1}, {"_key": "112358/13/21/1"}]]
+        ),
+        autospec=True,
+    )
+    a = Arche("112358/13/21", schema=get_schema, count=2)
+    a.validate_stream()
+    res = a.report.results["JSON Schema Validation"]
+    assert errors_equal(
+        res.messages[Level.ERROR][0].errors, {"'name' is a required property": {0, 1}}
+    )
+    assert res.keys_url == f"{SH_URL}/112358/13/21/item/"
+    assert a._source_items is None
+
+
+def test_save_result_keys_url(get_job_items):
+    a = Arche(pd.DataFrame({"name": ["a"]}))
+    a.source_items
+    a.save_result(Result("source"))
+    a.save_result(Result("target"), get_job_items)
+    assert a.report.results["source"].keys_url is None
+    assert a.report.results["target"].keys_url == f"{SH_URL}/112358/13/21/item/"
+
+
+def test_validate_stream_fails(get_schema):
+    with pytest.raises(ValueError) as excinfo:
+        Arche("112358/collections/s/pages", schema=get_schema).validate_stream()
+    assert str(excinfo.value) == (
+        "'112358/collections/s/pages' is not a job key, only jobs are streamed"
+    )
+
+
+def test_validate_incrementally(mocker, tmp_path, get_schema):
+    mocker.patch("arche.report.Report.__call__", autospec=True)
+    mocker.patch("arche.readers.items.StreamingJobItems.job", autospec=True)
+    items_count_mock = mocker.patch(
+        "arche.tools.api.get_items_count", return_value=2, autospec=True
+    )
+    job_items = [
+        {"_key": "112358/13/21/0"},
+        {"_key": "112358/13/21/1", "name": "Book"},
+        {"_key": "112358/13/21/2"},
+    ]
+    iter_items_mock = mocker.patch(
+        "arche.tools.api.iter_items",
+        side_effect=lambda key, count, start_index, *args, **kwargs: iter(
+            [job_items[start_index : start_index + count]]
+        ),
+        autospec=True,
+    )
+    state_path = str(tmp_path / "state.json")
+    a = Arche("112358/13/21", schema=get_schema)
+    a.validate_incrementally(state_path)
+    items_count_mock.return_value = 3
+    a.validate_incrementally(state_path)
+
+    assert iter_items_mock.call_args[0][1:3] == (1, 2)
+    res = a.report.results["JSON Schema Validation"]
+    assert errors_equal(
+        res.messages[Level.ERROR][0].errors,
+        {"data must contain ['name'] properties": {0, 2}},
+    )
+    assert schema_tools.ValidationState.load(state_path).next_index == 3
+
+
 def test_validate_with_json_schema_fails(mocker, get_job_items, get_schema):
     mocked_display = mocker.patch("arche.report.display_html", autospec=True)
     url = f"{SH_URL}/112358/13/21/item/1"
@@ -241,7 +379,7 @@ def test_validate_with_json_schema_fails(mocker, get_job_items, get_schema):
                 (
                     "1 (25%) items have 1 errors",
                     None,
-                    {"'price' is a required property": {url}},
+                    {"'price' is a required property": {1}},
                 )
             ]
         },
@@ -256,6 +394,7 @@ def test_validate_with_json_schema_fails(mocker, get_job_items, get_schema):
     assert a.report.results.get("JSON Schema Validation") == res
     report_html = get_report_from_iframe(mocked_display.mock_calls[0][1][0])
     assert "JSON Schema Validation - FAILED" in report_html
+    assert f'href="{url}"' in report_html
 
 
 @pytest.mark.parametrize(
@@ -114,6 +114,14 @@ def test_sample_keys(mocker, keys, limit, sample_mock, expected_sample):
     assert Report.sample_keys(keys, limit) == expected_sample
 
 
+def test_sample_keys_url():
+    keys_url = f"{SH_URL}/112358/13/21/item/"
+    assert (
+        Report.sample_keys(pd.Series([0, 5]), 2, keys_url)
+        == f"[0]({keys_url}0), [5]({keys_url}5)"
+    )
+
+
 def test_save():
     r = Report()
     dummy_result = create_result("dummy", {Level.INFO: [("outcome",)]})
@@ -112,3 +112,127 @@ def test_get_items_with_pool(mocker, count, start_index, expected_items):
     np.testing.assert_array_equal(
         api.get_items_with_pool("k", count, start_index), expected_items
     )
+
+
+@pytest.mark.parametrize("workers", [1, 3, 10])
+def test_get_items_with_pool_order(mocker, workers):
+    mocker.patch(
+        "arche.tools.api.get_source", return_value=Source(source_items), autospec=True
+    )
+    mocker.patch("arche.tools.api.helpers.cpus_count", return_value=1, autospec=True)
+    items = api.get_items_with_pool("k", 6, 0, workers=workers, p_bar=None)
+    np.testing.assert_array_equal(items, np.array(source_items))
+
+
+def test_get_items_with_pool_one_source(mocker):
+    get_source = mocker.patch(
+        "arche.tools.api.get_source", return_value=Source(source_items), autospec=True
+    )
+    mocker.patch("arche.tools.api.helpers.cpus_count", return_value=1, autospec=True)
+    items = api.get_items_with_pool("112358/13/21", 6, 0, workers=3, p_bar=None)
+    np.testing.assert_array_equal(items, np.array(source_items))
+    get_source.assert_called_once_with("112358/13/21")
+
+
+@pytest.mark.parametrize(
+    "count, start_index, workers, expected_keys",
+    [
+        (6, 0, 1, ["0", "2", "3", "5"]),
+        (6, 0, 10, ["0", "2", "3", "5"]),
+        (2, 2, 4, ["2", "3"]),
+        (3, 3, 2, ["3", "5"]),
+    ],
+)
+def test_get_items_with_pool_filters(
+    mocker, count, start_index, workers, expected_keys
+):
+    mocker.patch(
+        "arche.tools.api.get_source", return_value=Source(source_items), autospec=True
+    )
+    mocker.patch("arche.tools.api.helpers.cpus_count", return_value=1, autospec=True)
+    items = api.get_items_with_pool(
+        "112358/13/21",
+        count,
+        start_index,
+        workers=workers,
+        filters=[("_type", ["NameItem"])],
+        p_bar=None,
+    )
+    assert [i["_key"] for i in items] == expected_keys
+
+
+@pytest.mark.parametrize(
+    "count, start, filters, expected_keys",
+    [
+        (6, None, None, ["0", "1", "2", "3", "4", "5"]),
+        (3, "2", None, ["2", "3", "4"]),
+        (6, None, [("_type", ["AddressItem"])], ["1", "4"]),
+        (0, None, None, []),
+    ],
+)
+def test_get_collection_items_with_pool(mocker, count, start, filters, expected_keys):
+    mocker.patch(
+        "arche.tools.api.get_source",
+        return_value=StoreSource(source_items),
+        autospec=True,
+    )
+    mocker.patch("arche.tools.api.helpers.cpus_count", return_value=1, autospec=True)
+    items = api.get_collection_items_with_pool(
+        "112358/collections/s/pages", count, start, filters, workers=4, p_bar=None
+    )
+    assert [i["_key"] for i in items] == expected_keys
+
+
+@pytest.mark.parametrize(
+    "count, chunk_size, expected_lengths",
+    [(6, 4, [4, 2]), (6, 6, [6]), (3, 2, [2, 1]), (0, 2, [])],
+)
+def test_iter_items(mocker, count, chunk_size, expected_lengths):
+    mocker.patch(
+        "arche.tools.api.get_source", return_value=Source(source_items), autospec=True
+    )
+    chunks = list(
+        api.iter_items("k", count, 0, None, chunk_size=chunk_size, p_bar=None)
+    )
+    assert [len(c) for c in chunks] == expected_lengths
+    if chunks:
+        np.testing.assert_array_equal(np.concatenate(chunks), source_items[:count])
+
+
+@pytest.mark.parametrize(
+    "filters, expected_total", [(None, 6), ([("_type", ["NameItem"])], None)]
+)
+def test_iter_items_p_bar_total(mocker, filters, expected_total):
+    mocker.patch(
+        "arche.tools.api.get_source", return_value=Source(source_items), autospec=True
+    )
+    p_bar = mocker.Mock(side_effect=lambda items, **kwargs: items)
+    list(api.iter_items("k", 6, 0, None, filters, p_bar=p_bar))
+    assert p_bar.call_args[1]["total"] == expected_total
+
+
+@pytest.mark.parametrize(
+    "fields, expected_items",
+    [
+        (None, source_items[:2]),
+        (["name"], [{"_key": "0", "name": "Elizabeth"}, {"_key": "1"}]),
+        ([], [{"_key": "0"}, {"_key": "1"}]),
+    ],
+)
+def test_iter_source(mocker, fields, expected_items):
+    mocker.patch(
+        "arche.tools.api.get_source", return_value=Source(source_items), autospec=True
+    )
+    assert list(api.iter_source("k", None, 2, fields=fields)) == expected_items
+
+
+def test_get_items_with_pool_fields(mocker):
+    mocker.patch(
+        "arche.tools.api.get_source", return_value=Source(source_items), autospec=True
+    )
+    mocker.patch("arche.tools.api.helpers.cpus_count", return_value=1, autospec=True)
+    items = api.get_items_with_pool("k", 6, 0, fields=["zip"], p_bar=None)
+    assert items.tolist() == [
+        {"_key": i["_key"], **({"zip": i["zip"]} if "zip" in i else {})}
+        for i in source_items
+    ]
@@ -0,0 +1,114 @@
+import os
+
+from arche.readers.items import CollectionItems, JobItems
+from arche.tools.cache import Cache
+from conftest import CLOUD_ITEMS, Job
+import numpy as np
+import pytest
+
+
+@pytest.fixture(scope="function")
+def cache(tmp_path):
+    return Cache(str(tmp_path))
+
+
+def test_cache_path(mocker, tmp_path):
+    mocker.patch.dict(os.environ, {"ARCHE_CACHE_DIR": str(tmp_path)})
+    assert Cache().path == tmp_path
+
+
+@pytest.mark.parametrize(
+    "params, other_params",
+    [
+        (("112358/13/21", "112358/13/21/0", 4, None), ("112358/13/21", None, 4, None)),
+        (
+            ("112358/13/21", "112358/13/21/0", 4, None),
+            ("112358/13/21", "112358/13/21/0", 4, [("_type", ["NameItem"])]),
+        ),
+    ],
+)
+def test_make_key(params, other_params):
+    key = Cache.make_key(*params)
+    assert key.startswith("112358_13_21-")
+    assert key == Cache.make_key(*params)
+    assert key != Cache.make_key(*other_params)
+
+
+def test_set_get(cache):
+    assert cache.get("key") is None
+    cache.set("key", CLOUD_ITEMS)
+    np.testing.assert_array_equal(cache.get("key"), np.array(CLOUD_ITEMS))
+
+
+def test_evict(tmp_path):
+    cache = Cache(str(tmp_path), max_size=0)
+    cache.set("key", CLOUD_ITEMS)
+    assert cache.get("key") is None
+
+    cache.max_size = 1024
+    cache.set("old", CLOUD_ITEMS)
+    os.utime(cache.path / "old.msgpack", (0, 0))
+    cache.set("new", CLOUD_ITEMS)
+    cache.max_size = cache.size - 1
+    cache.evict()
+    assert cache.get("old") is None
+    assert cache.get("new") is not None
+
+
+def test_invalidate(cache):
+    keys = [Cache.make_key(k, None, 1) for k in ["1/2/3", "1/2/30", "1/2/3"[:3]]]
+    for key in keys:
+        cache.set(key, CLOUD_ITEMS[:1])
+    cache.set(Cache.make_key("1/2/3", None, 2), CLOUD_ITEMS[:1])
+
+    cache.invalidate("1/2/3")
+    assert [cache.get(k) is None for k in keys] == [True, False, False]
+    cache.invalidate()
+    assert not cache.size
+
+
+@pytest.mark.parametrize("state, expected_calls", [("finished", 1), ("running", 2)])
+def test_cached_job_items(mocker, cache, state, expected_calls):
+    mocker.patch(
+        "arche.readers.items.JobItems.job",
+        Job(metadata={"state": state}),
+    )
+    raw = np.array([{"_key": f"112358/13/21/{i}", "name": "Book"} for i in range(4)])
+    fetch_mock = mocker.patch(
+        "arche.tools.api.get_items", return_value=raw, autospec=True
+    )
+    for _ in range(2):
+        items = JobItems("112358/13/21", count=4, cache=cache)
+        np.testing.assert_array_equal(items.raw, raw)
+    assert fetch_mock.call_count == expected_calls
+
+
+@pytest.mark.parametrize("collections, expected_calls", [(False, 2), (True, 1)])
+def test_cached_collection_items(mocker, tmp_path, collections, expected_calls):
+    cache = Cache(str(tmp_path), collections=collections)
+    raw = np.array([{"_key": f"k{i}", "name": "Book"} for i in range(4)])
+    fetch_mock = mocker.patch(
+        "arche.tools.api.get_items", return_value=raw, autospec=True
+    )
+    for _ in range(2):
+        items = CollectionItems("112358/collections/s/pages", count=4, cache=cache)
+        np.testing.assert_array_equal(items.raw, raw)
+    assert fetch_mock.call_count == expected_calls
+
+
+def test_set_leaves_no_temp_files(cache):
+    cache.set("key", CLOUD_ITEMS)
+    cache.set("key", CLOUD_ITEMS[:1])
+    assert [p.name for p in cache.path.iterdir()] == ["key.msgpack"]
+    np.testing.assert_array_equal(cache.get("key"), np.array(CLOUD_ITEMS[:1]))
+
+
+@pytest.mark.parametrize(
+    "damage", [lambda data: data[:-2], lambda data: b"\xc1" + data]
+)
+def test_get_broken(cache, damage):
+    cache.set("key", CLOUD_ITEMS)
+    path = cache.path / "key.msgpack"
+    path.write_bytes(damage(path.read_bytes()))
+    assert cache.get("key") is None
+    assert not path.exists()
@@ -1,4 +1,5 @@
 import arche.tools.helpers as h
+import numpy as np
 import pytest
 
 
@@ -24,6 +25,31 @@ def test_ratio_diff(new_value, old_value, expected):
     assert h.ratio_diff(new_value, old_value) == expected
 
 
+def test_ratio_diffs():
+    source, target, expected = zip(*input_ratio_values)
+    np.testing.assert_array_equal(
+        h.ratio_diffs(
+            np.nan_to_num(h.to_floats(np.array(source, dtype=object))),
+            np.nan_to_num(h.to_floats(np.array(target, dtype=object))),
+        ),
+        expected,
+    )
+
+
+@pytest.mark.parametrize(
+    "values, expected",
+    [
+        (np.array([1, 2]), [1.0, 2.0]),
+        (
+            np.array(["1.5", None, "", "a", 3, True], dtype=object),
+            [1.5] + [np.nan] * 3 + [3.0, 1.0],
+        ),
+    ],
+)
+def test_to_floats(values, expected):
+    np.testing.assert_array_equal(h.to_floats(values), expected)
+
+
 @pytest.mark.parametrize(
     "value, expected", [(1, 1.0), (0, 0.0), ("0", 0.0), ("", 0.0), (None, 0.0)]
 )
@@ -1,7 +1,9 @@
 from collections import deque
+import itertools
 
 import arche.tools.schema as schema_tools
 import numpy as np
+import pandas as pd
 import pytest
 
 schema = {
@@ -45,6 +47,20 @@ def test_set_item_no():
     assert schema_tools.set_item_no(1) == [0]
     assert len(schema_tools.set_item_no(5)) == 4
     assert len(schema_tools.set_item_no(124112414)) == 4
+    assert len(schema_tools.set_item_no(124112414, 1000)) == 1000
+    assert schema_tools.set_item_no(3, 1000) == [0, 1, 2]
+
+
+@pytest.mark.parametrize(
+    "numbers, expected_ranges",
+    [
+        ([0], [(0, 1)]),
+        ([5, 3, 4, 9, 0, 4], [(0, 1), (3, 3), (9, 1)]),
+        ([2, 1, 0], [(0, 3)]),
+    ],
+)
+def test_to_ranges(numbers, expected_ranges):
+    assert schema_tools.to_ranges(numbers) == expected_ranges
 
 
 def test_infer_schema():
@@ -70,14 +86,17 @@ def test_basic_json_schema(mocker):
         "arche.tools.schema.create_json_schema", return_value=schema, autospec=True
     )
     assert schema_tools.basic_json_schema("235801/1/15", [0, 5]).raw == schema
-    mocked_create_js.assert_called_once_with("235801/1/15", [0, 5])
+    mocked_create_js.assert_called_once_with("235801/1/15", [0, 5], 4)
 
 
-def test_create_json_schema(mocker, get_job, get_raw_items):
+def test_create_json_schema(mocker, get_job):
     mocker.patch("arche.tools.api.get_job", return_value=get_job, autospec=True)
-    mocker.patch("arche.tools.api.get_items", return_value=get_raw_items, autospec=True)
+    mocker.patch(
+        "arche.tools.api.get_source", return_value=get_job.items, autospec=True
+    )
+    read_spy = mocker.spy(schema_tools.api, "read_ranges")
     schema_tools.create_json_schema(get_job.key, [2])
-    assert schema_tools.create_json_schema(get_job.key, [2, 3]) == {
+    assert schema_tools.create_json_schema(get_job.key, [0, 3, 2]) == {
         "$schema": "http://json-schema.org/draft-07/schema#",
         "definitions": {
             "url": {
@@ -89,9 +108,10 @@ def test_create_json_schema(mocker, get_job, get_raw_items):
         },
         "additionalProperties": False,
         "type": "object",
-        "properties": {"name": {"type": "string"}, "price": {"type": "integer"}},
+        "properties": {"price": {"type": "integer"}, "name": {"type": "string"}},
         "required": ["name", "price"],
     }
+    assert read_spy.call_args[0][1] == [("112358/13/21/0", 1), ("112358/13/21/2", 2)]
 
 
 @pytest.mark.parametrize(
@@ -163,13 +183,86 @@ def test_full_validate_fails():
     assert errors == {"NAME is not of type 'string'": {0, 1}}
 
 
-def test_full_validate_type_key():
-    errors = schema_tools.full_validate(
-        {"properties": {"A": {"type": "number"}}, "additionalProperties": False},
-        np.array([{"A": 0, "_key": "0", "_type": "Some"}, {"A": 1}]),
-        [0, 1],
+@pytest.mark.parametrize("method", ["fast", "full", "hybrid"])
+def test_validate_type_key(method):
+    schema = {"properties": {"A": {"type": "number"}}, "additionalProperties": False}
+    raw_items = [{"A": 0, "_key": "0", "_type": "Some"}, {"A": 1}]
+    errors = schema_tools.validate_items(
+        schema, np.array(raw_items), [0, 1], method, memo_size=2
     )
     assert not errors
+    assert raw_items[0] == {"A": 0, "_key": "0", "_type": "Some"}
+    assert schema == {
+        "properties": {"A": {"type": "number"}},
+        "additionalProperties": False,
+    }
+
+
+@pytest.mark.parametrize("method", ["fast", "full", "hybrid"])
+@pytest.mark.parametrize(
+    "schema, raw_items, expected_invalid",
+    [
+        (
+            {"type": "object", "minProperties": 2},
+            [{"_key": "0", "_type": "Some", "a": 1}, {"a": 1, "b": 2}],
+            {0},
+        ),
+        (
+            {"type": "object", "maxProperties": 2},
+            [{"_key": "0", "_type": "Some", "a": 1, "b": 2}, {"a": 1, "b": 2, "c": 3}],
+            {1},
+        ),
+        (
+            {"propertyNames": {"pattern": "^[a-z]+$"}},
+            [{"_key": "0", "_type": "Some", "a": 1}, {"A": 1}],
+            {1},
+        ),
+    ],
+)
+def test_validate_meta_view(method, schema, raw_items, expected_invalid):
+    errors = schema_tools.validate_items(schema, np.array(raw_items), [0, 1], method)
+    assert set(itertools.chain.from_iterable(errors.values())) == expected_invalid
+    assert "_key" in raw_items[0]
+
+
+@pytest.mark.parametrize(
+    "schema, expected_view",
+    [
+        ({"type": "object", "properties": {}, "additionalProperties": False}, False),
+        ({"title": "Item", "required": ["a"], "definitions": {}}, False),
+        ({"type": "object", "minProperties": 1}, True),
+        ({"allOf": [{"additionalProperties": False}]}, True),
+    ],
+)
+def test_needs_item_view(schema, expected_view):
+    assert schema_tools.needs_item_view(schema) is expected_view
+
+
+def test_validate_workers_compiles_once(tmp_path):
+    schema_tools.fast_validate(
+        {"type": "object", "properties": {"v": {"type": "number"}}},
+        [{"v": 0}, {"v": "1"}, {"v": 2}],
+        pd.Index([0, 1, 2]),
+        workers=2,
+    )
+    assert len(list((tmp_path / "cache" / "validators").glob("*.py"))) == 1
+
+
+@pytest.mark.parametrize(
+    "schema, expected_schema",
+    [
+        ({}, {"properties": {"_type": {}, "_key": {}}}),
+        (
+            {
+                "properties": {"_key": {"type": "integer"}, "a": {}},
+                "required": ["_key"],
+            },
+            {"properties": {"_type": {}, "_key": {}, "a": {}}, "required": []},
+        ),
+    ],
+)
+def test_ignore_meta(schema, expected_schema):
+    assert schema_tools.ignore_meta(schema) == expected_schema
 
 
 def test_fast_validate_fails():
@@ -186,3 +279,246 @@ def test_fast_validate(get_schema, get_raw_items):
         get_schema, get_raw_items, keys=list(range(len(get_raw_items)))
     )
     assert not errors
+
+
+@pytest.mark.parametrize(
+    "validate, expected_errors",
+    [
+        (
+            schema_tools.fast_validate,
+            {
+                "data.v must be number": {"1", "3", "4"},
+                "data must contain ['v'] properties": {"2"},
+            },
+        ),
+        (
+            schema_tools.full_validate,
+            {
+                "v is not of type 'number'": {"1", "3", "4"},
+                "'v' is a required property": {"2"},
+            },
+        ),
+        (
+            schema_tools.hybrid_validate,
+            {
+                "v is not of type 'number'": {"1", "3", "4"},
+                "'v' is a required property": {"2"},
+            },
+        ),
+    ],
+)
+@pytest.mark.parametrize("workers", [1, 2, 8])
+def test_validate_workers(validate, expected_errors, workers):
+    errors = validate(
+        {"type": "object", "properties": {"v": {"type": "number"}}, "required": ["v"]},
+        [{"v": 0}, {"v": "1"}, {"_key": "2"}, {"v": "3"}, {"v": None}],
+        pd.Index(["0", "1", "2", "3", "4"]),
+        workers=workers,
+    )
+    assert errors == expected_errors
+
+
+def test_hybrid_validate(mocker):
+    schema = {
+        "type": "object",
+        "properties": {"a": {"type": "string"}, "b": {"type": "string"}},
+    }
+    iter_errors_spy = mocker.spy(schema_tools.validators.Draft7Validator, "iter_errors")
+    errors = schema_tools.hybrid_validate(
+        schema, [{"a": "a", "b": "b"}, {"a": 0, "b": 1}, {"a": "a"}], [0, 1, 2]
+    )
+    assert errors == {
+        "a is not of type 'string'": {1},
+        "b is not of type 'string'": {1},
+    }
+    # jsonschema descends into both properties of the only failed item
+    assert iter_errors_spy.call_count == 3
+
+
+def test_compile_validator_fails():
+    with pytest.raises(ValueError) as excinfo:
+        schema_tools.compile_validator({}, "slow")
+    assert str(excinfo.value) == "'slow' is not a validation method"
+
+
+def test_schema_hash():
+    schema = {"type": "object", "properties": {"a": {}, "b": {}}}
+    same_schema = {"properties": {"b": {}, "a": {}}, "type": "object"}
+    assert schema_tools.schema_hash(schema) == schema_tools.schema_hash(same_schema)
+    assert schema_tools.schema_hash(schema) != schema_tools.schema_hash({})
+
+
+def test_compile_fast_validator(mocker, tmp_path):
+    mocker.patch.dict(schema_tools._fast_validators, clear=True)
+    compile_spy = mocker.spy(schema_tools.fastjsonschema, "compile_to_code")
+    schema = {"type": "object", "properties": {"v": {"type": "number"}}}
+
+    validate = schema_tools.compile_fast_validator(schema)
+    same_schema = {"properties": {"v": {"type": "number"}}, "type": "object"}
+    assert schema_tools.compile_fast_validator(same_schema) is validate
+    assert len(list((tmp_path / "cache" / "validators").glob("*.py"))) == 1
+
+    schema_tools._fast_validators.clear()
+    validate = schema_tools.compile_fast_validator(schema)
+    assert compile_spy.call_count == 1
+    with pytest.raises(schema_tools.fastjsonschema.JsonSchemaException):
+        validate({"v": "1"})
+
+
+def test_compile_fast_validator_broken_file(mocker, tmp_path):
+    mocker.patch.dict(schema_tools._fast_validators, clear=True)
+    schema = {"properties": {"v": {"type": "number"}}}
+    schema_tools.compile_fast_validator(schema)
+    validators_path = tmp_path / "cache" / "validators"
+    (path,) = validators_path.glob("*.py")
+    path.write_text("def validate(data:")
+
+    schema_tools._fast_validators.clear()
+    validate = schema_tools.compile_fast_validator(schema)
+    with pytest.raises(schema_tools.fastjsonschema.JsonSchemaException):
+        validate({"v": "1"})
+    assert "def validate(data:" not in path.read_text()
+    assert list(validators_path.iterdir()) == [path]
+
+
+def test_errors_memo():
+    item_errors = schema_tools.compile_validator(
+        {"properties": {"v": {"type": "number"}}}, "full"
+    )
+    memo = schema_tools.ErrorsMemo(item_errors, maxsize=2)
+    items = [{"v": "1"}, {"_key": "1", "v": "1"}, {"v": 0}, {"v": 1}, {"v": "1"}]
+    assert [memo(i) for i in items] == [["v is not of type 'number'"]] * 2 + [
+        [],
+        [],
+        ["v is not of type 'number'"],
+    ]
+    assert (memo.hits, memo.misses) == (1, 4)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_validate_memo_size(mocker, workers):
+    report_mock = mocker.patch("arche.tools.schema.report_hit_rate", autospec=True)
+    errors = schema_tools.full_validate(
+        {"properties": {"v": {"type": "number"}}},
+        [{"v": "1"}] * 3 + [{"v": 1}],
+        [0, 1, 2, 3],
+        workers=workers,
+        memo_size=10,
+    )
+    assert errors == {"v is not of type 'number'": {0, 1, 2}}
+    _, hits, total = report_mock.call_args[0]
+    # shards of identical items can go to different processes
+    assert hits == 2 if workers == 1 else hits <= 2
+    assert total == 4
+
+
+columnar_items = [
+    {"_key": "0", "name": "Alice", "price": 10, "size": "M", "tags": ["a"]},
+    {"_key": "1", "name": "bob", "price": -1.5, "size": "XXL", "tags": []},
+    {"_key": "2", "name": None, "price": "10", "size": 1, "tags": "a"},
+    {"_key": "3", "name": "", "price": True, "tags": [1], "extra": 1},
+    {"_key": "4", "name": "A" * 20, "price": 1.0, "size": None},
+    {"_key": "5", "price": 10**20, "size": "S"},
+]
+
+
+@pytest.mark.parametrize(
+    "schema",
+    [
+        {
+            "$schema": "http://json-schema.org/draft-07/schema",
+            "type": "object",
+            "properties": {
+                "name": {"type": "string", "pattern": "^[A-Z]", "maxLength": 10},
+                "price": {"type": "integer", "minimum": 0, "maximum": 100},
+                "size": {"type": ["string", "null"], "enum": ["S", "M", None]},
+                "tags": {"type": "array", "items": {"type": "string"}},
+            },
+        },
+        {
+            "$schema": "http://json-schema.org/draft-04/schema",
+            "properties": {
+                "name": {
+                    "type": ["string", "null"],
+                    "minLength": 1,
+                    "tag": "name_field",
+                },
+                "price": {"type": "number", "maximum": 10},
+                "size": {"enum": ["S", "M", 1]},
+            },
+            "required": ["name", "size"],
+            "additionalProperties": False,
+        },
+        {"properties": {"price": {"enum": [1, 10]}, "tags": {"format": "email"}}},
+        {"properties": {"price": {"type": "integer"}}, "additionalProperties": False},
+        {"properties": {"_key": {"type": "string"}}, "required": ["_key", "name"]},
+    ],
+)
+def test_columnar_validate(schema):
+    keys = pd.Index([f"item/{i}" for i in range(len(columnar_items))])
+    expected_errors = schema_tools.full_validate(
+        schema, [dict(i) for i in columnar_items], keys
+    )
+    assert expected_errors
+    errors = schema_tools.columnar_validate(
+        schema, (dict(i) for i in columnar_items), keys
+    )
+    assert errors == expected_errors
+
+
+@pytest.mark.parametrize(
+    "schema, expected_columns, expected_required, expected_residual",
+    [
+        ({"properties": {"a": {"type": "string", "tag": "unique"}}}, ["a"], [], None),
+        (
+            {"type": "object", "properties": {"a": {}, "b": {"format": "uri"}}},
+            ["a"],
+            [],
+            {"type": "object", "properties": {"b": {"format": "uri"}}},
+        ),
+        (
+            {"properties": {"a": {"type": "string"}}, "additionalProperties": False},
+            ["a"],
+            [],
+            {"properties": {"a": {}}, "additionalProperties": False},
+        ),
+        (
+            {"properties": {"_key": {"type": "string"}}, "required": ["_key", "a"]},
+            [],
+            ["a"],
+            {"properties": {"_key": {"type": "string"}}, "required": ["_key"]},
+        ),
+        (
+            {"properties": {"a": {"type": "string"}}, "required": ["a", "b"]},
+            ["a"],
+            ["a", "b"],
+            None,
+        ),
+    ],
+)
+def test_split_schema(schema, expected_columns, expected_required, expected_residual):
+    columns, required, residual = schema_tools.split_schema(schema)
+    assert list(columns) == expected_columns
+    assert required == expected_required
+    assert residual == expected_residual
+
+
+def test_stream_validate():
+    raw_items = iter([{"_key": "a", "v": 0}, {"_key": "b", "v": "1"}, {"_key": "c"}])
+    errors, items_count = schema_tools.stream_validate(
+        {"properties": {"v": {"type": "number"}}, "required": ["v"]}, raw_items, "full"
+    )
+    assert errors == {
+        "v is not of type 'number'": {"b"},
+        "'v' is a required property": {"c"},
+    }
+    assert items_count == 3
+
+
+def test_validation_state(tmp_path):
+    state = schema_tools.ValidationState(
+        "112358/13/21", "hash", "fast", 3, {"error": {2, 0}}
+    )
+    path = str(tmp_path / "state.json")
+    state.save(path)
+    assert schema_tools.ValidationState.load(path) == state